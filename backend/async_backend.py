@@ -0,0 +1,336 @@
+"""
+asyncio serving mode of the backend.
+
+Serves the same endpoints as the Flask app (`/set_config`,
+`/generate_and_get_operations`, `/submit_test`, `/get_operations`,
+`/get_correct_answers`, `/get_test_results`) on aiohttp. Every gateway call
+and confirmation wait is a coroutine, so in-flight transactions cost no OS
+threads. Decoding, the result cache, the local index and the scoreboard are
+shared with `backend.py`; their SQLite work runs on a small thread pool so it
+never blocks the event loop. Configurations and nonces are kept separately,
+since they are bound to the async gateway client.
+
+Run with: python async_backend.py
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+from multiversx_sdk import Address
+
+from async_gateway import AsyncGatewayClient
+from backend import (
+    CHAIN_ID,
+    CONFIRMATION_BACKOFF,
+    CONFIRMATION_INITIAL_DELAY,
+    CONFIRMATION_MAX_DELAY,
+    CONFIRMATION_TIMEOUT,
+    CONFIRMATION_WAIT,
+    HTTP_IN_FLIGHT,
+    HTTP_LATENCY,
+    HTTP_REQUESTS,
+    PROXY_URL,
+    TX_IN_FLIGHT,
+    VIEW_CACHE_TTL,
+    answers_to_hex,
+    cache_transaction_results,
+    confirmation_outcome,
+    indexer,
+    lookup_local_results,
+    scoreboard,
+)
+from config_registry import ConfigRegistry, ConfigurationError
+from confirmation import TransactionFailed, TransactionTimeout, wait_for_transaction_async
+from contract_views import ContractViews, decode_u64, test_results_arguments
+from metrics import CONTENT_TYPE, registry
+from nonces import NonceManager
+from singleflight import AsyncSingleFlight
+
+ASYNC_PORT = 5004
+# Upper bound on simultaneous gateway connections
+GATEWAY_CONNECTION_LIMIT = 100
+
+# Failover and hedging are only implemented by the threaded client; use the first gateway
+gateway = AsyncGatewayClient(PROXY_URL.split(",")[0], limit=GATEWAY_CONNECTION_LIMIT, limit_per_host=GATEWAY_CONNECTION_LIMIT)
+configs = ConfigRegistry(CHAIN_ID, gateway)
+# Nonces are seeded with awaited account reads, never by the manager itself
+nonce_manager = NonceManager(fetch_nonce=None)
+# Only the cache of ContractViews is used; queries go through the async client
+contract_views = ContractViews(gateway, ttl=VIEW_CACHE_TTL)
+# Concurrent identical upstream lookups share one call
+coalescer = AsyncSingleFlight()
+# Local SQLite work (result cache, index, scores) is kept off the event loop
+STORE_MAX_WORKERS = 8
+store_executor = ThreadPoolExecutor(max_workers=STORE_MAX_WORKERS, thread_name_prefix="store")
+
+logger = logging.getLogger(__name__)
+
+routes = web.RouteTableDef()
+
+
+class NoResultsError(ValueError):
+    pass
+
+
+def error_response(message, status):
+    return web.json_response({"error": message}, status=status)
+
+
+def confirmation_error_response(error):
+    if isinstance(error, TransactionTimeout):
+        return web.json_response({"error": str(error), "status": "timeout", "tx_hash": error.tx_hash}, status=504)
+    return web.json_response({"error": str(error), "status": error.status, "reason": error.reason, "tx_hash": error.tx_hash}, status=422)
+
+
+def request_config(body, query):
+    contract = body.get("contract_address") or query.get("contract_address")
+    wallet = body.get("wallet_address") or query.get("wallet_address")
+    return configs.get(contract, wallet)
+
+
+async def fetch_transaction_data(tx_hash):
+    return await coalescer.do("transaction", tx_hash, lambda: gateway.get_transaction(tx_hash))
+
+
+async def wait_for_confirmation(tx_hash, sender_address):
+    started = time.perf_counter()
+    error = None
+    try:
+        with TX_IN_FLIGHT.track_inprogress():
+            return await wait_for_transaction_async(
+                fetch_transaction_data,
+                tx_hash,
+                timeout=CONFIRMATION_TIMEOUT,
+                initial_delay=CONFIRMATION_INITIAL_DELAY,
+                max_delay=CONFIRMATION_MAX_DELAY,
+                backoff=CONFIRMATION_BACKOFF,
+            )
+    except TransactionTimeout as e:
+        error = e
+        # A dropped or stuck transaction leaves a nonce gap that no later send reports
+        nonce_manager.resync(sender_address)
+        raise
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        CONFIRMATION_WAIT.observe(time.perf_counter() - started, outcome=confirmation_outcome(error))
+
+
+@web.middleware
+async def metrics_middleware(request, handler):
+    route = request.match_info.route.resource
+    endpoint = route.canonical if route is not None else "unmatched"
+    started = time.perf_counter()
+    status = 500
+    with HTTP_IN_FLIGHT.track_inprogress():
+        try:
+            response = await handler(request)
+            status = response.status
+            return response
+        except web.HTTPException as e:
+            status = e.status
+            raise
+        finally:
+            HTTP_LATENCY.observe(time.perf_counter() - started, endpoint=endpoint, method=request.method)
+            HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=status)
+
+
+async def run_blocking(fn, *args):
+    """
+    Run a blocking call (SQLite reads and writes) on the store thread pool.
+    """
+    return await asyncio.get_running_loop().run_in_executor(store_executor, fn, *args)
+
+
+async def get_transaction_results(tx_hash):
+    record = await run_blocking(lookup_local_results, tx_hash)
+    if record is None:
+        record = await coalescer.do("transaction_results", tx_hash, lambda: fetch_and_cache_results(tx_hash))
+    return record
+
+
+async def fetch_and_cache_results(tx_hash):
+    return await run_blocking(cache_transaction_results, tx_hash, await fetch_transaction_data(tx_hash))
+
+
+async def send_with_local_nonce(config, sender_address, tx, retries=1):
+    """
+    Sign and send a transaction under the sender's next local nonce, resyncing on nonce errors.
+    """
+    async def sign_and_send(nonce):
+        return await gateway.send_transaction(config.sign(tx, nonce))
+
+    return await nonce_manager.send_async(sender_address, gateway.get_account_nonce, sign_and_send, retries=retries)
+
+
+@routes.post("/set_config")
+async def set_config(request):
+    try:
+        data = await request.json()
+        config = configs.register(data["contract_address"], data["wallet_pem"])
+        indexer.follow(config.contract_address)
+        scoreboard.follow(config.contract_address)
+        return web.json_response({
+            "message": "Configuration set successfully.",
+            "contract_address": config.contract_address,
+            "wallet_address": config.wallet_address
+        })
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+@routes.post("/generate_and_get_operations")
+async def generate_and_get_operations(request):
+    try:
+        body = await request.json()
+        config = request_config(body, request.query)
+        sender_address = Address.from_bech32(body["sender_address"])
+
+        tx = config.create_call(sender_address, "generate_test")
+        tx_hash = await send_with_local_nonce(config, sender_address, tx)
+
+        data = await wait_for_confirmation(tx_hash, sender_address)
+        record = await run_blocking(cache_transaction_results, tx_hash, data)
+        await run_blocking(scoreboard.observe, config.contract_address, "generate_test", body["sender_address"], tx_hash, record)
+        operations = record["operations"]
+        if operations is None:
+            raise NoResultsError("No smart contract results found")
+
+        return web.json_response({"message": "Test generated and operations fetched successfully", "tx_hash": tx_hash, "operations": operations})
+    except ConfigurationError as e:
+        return error_response(str(e), 400)
+    except NoResultsError as e:
+        return error_response(str(e), 404)
+    except (TransactionTimeout, TransactionFailed) as e:
+        return confirmation_error_response(e)
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+@routes.post("/submit_test")
+async def submit_test(request):
+    try:
+        body = await request.json()
+        config = request_config(body, request.query)
+        sender_address_str = body["sender_address"]
+        sender_address = Address.from_bech32(sender_address_str)
+        answers_hex = answers_to_hex(body["answers"])
+
+        tx = config.create_call(sender_address, "submit_test", arguments=[bytes.fromhex(answers_hex)])
+        tx_hash = await send_with_local_nonce(config, sender_address, tx)
+        await run_blocking(scoreboard.submitted, config.contract_address, sender_address_str, tx_hash)
+
+        try:
+            data = await wait_for_confirmation(tx_hash, sender_address)
+        except TransactionFailed:
+            # A failed submission never reaches the contract's score
+            await run_blocking(scoreboard.settled, config.contract_address, sender_address_str, tx_hash)
+            raise
+        contract_views.invalidate(config.contract_address, sender_address_str)
+
+        record = await run_blocking(cache_transaction_results, tx_hash, data)
+        await run_blocking(scoreboard.observe, config.contract_address, "submit_test", sender_address_str, tx_hash, record)
+        if record["correct_answers"] is None:
+            raise NoResultsError("No smart contract results found")
+
+        return web.json_response({
+            "message": "Test submitted successfully",
+            "tx_hash": tx_hash,
+            "correct_answers": f"{record['correct_answers']}/5 correct answers",
+            "wrong_questions": record["wrong_questions"]
+        })
+    except ConfigurationError as e:
+        return error_response(str(e), 400)
+    except NoResultsError as e:
+        return error_response(str(e), 404)
+    except (TransactionTimeout, TransactionFailed) as e:
+        return confirmation_error_response(e)
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+@routes.get("/get_operations")
+async def get_operations(request):
+    tx_hash = request.query.get("tx_hash")
+    if not tx_hash:
+        return error_response("Missing 'tx_hash' parameter", 400)
+
+    try:
+        operations = (await get_transaction_results(tx_hash))["operations"]
+        if operations is None:
+            return error_response("No smart contract results found", 404)
+        return web.json_response({"operations": operations})
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+@routes.get("/get_correct_answers")
+async def get_correct_answers(request):
+    tx_hash = request.query.get("tx_hash")
+    if not tx_hash:
+        return error_response("Missing 'tx_hash' parameter", 400)
+
+    try:
+        correct_answers = (await get_transaction_results(tx_hash))["correct_answers"]
+    except Exception as e:
+        logger.warning("Error extracting correct answers: %s", e)
+        correct_answers = None
+
+    return web.json_response({
+        "tx_hash": tx_hash,
+        "correct_answers": f"{correct_answers or 0}/5 correct answers"
+    })
+
+
+@routes.post("/get_test_results")
+async def get_test_results(request):
+    data = await request.json()
+    contract_address = data.get("contract_address")
+    user_address = data.get("user_address")
+
+    if not contract_address or not user_address:
+        return error_response("Both contract_address and user_address are required.", 400)
+
+    try:
+        test_results = contract_views.lookup(contract_address, user_address)
+        if test_results is None:
+            test_results = await coalescer.do("test_results", (contract_address, user_address), lambda: query_test_results(contract_address, user_address))
+        return web.json_response({"test_results": test_results})
+    except Exception as e:
+        return error_response(f"Query failed: {str(e)}", 500)
+
+
+async def query_test_results(contract_address, user_address):
+    return_data = await gateway.query_contract(contract_address, "test_results", test_results_arguments(user_address))
+    test_results = decode_u64(return_data[0] if return_data else "")
+    contract_views.store(contract_address, user_address, test_results)
+    return test_results
+
+
+@routes.get("/gateway_stats")
+async def gateway_stats(request):
+    return web.json_response({**gateway.stats(), "nonces": nonce_manager.stats(), "singleflight": coalescer.stats()})
+
+
+@routes.get("/metrics")
+async def metrics(request):
+    return web.Response(text=registry.render(), headers={"Content-Type": CONTENT_TYPE})
+
+
+async def close_gateway(app):
+    await gateway.close()
+
+
+def create_app():
+    app = web.Application(middlewares=[metrics_middleware])
+    app.add_routes(routes)
+    app.on_cleanup.append(close_gateway)
+    return app
+
+
+if __name__ == "__main__":
+    print("Starting asyncio API for AssigningStudents Smart Contract...")
+    web.run_app(create_app(), port=ASYNC_PORT)
@@ -0,0 +1,122 @@
+import asyncio
+import random
+import time
+
+import aiohttp
+
+from gateway import GATEWAY_LATENCY, GATEWAY_REQUESTS, GATEWAY_RETRIES, RETRY_STATUS_CODES, ContractQueryError, GatewayError, gateway_route
+
+
+class AsyncGatewayClient:
+    """
+    asyncio counterpart of `GatewayClient`, backed by one aiohttp session.
+
+    The connector caps the number of simultaneous upstream connections, so
+    thousands of waiting coroutines share a bounded pool of keep-alive sockets.
+    The session is created lazily on first use, inside the running event loop.
+    """
+
+    def __init__(self, base_url, limit=100, limit_per_host=100, timeout=10.0, max_retries=3, backoff=0.25):
+        self.base_url = base_url.rstrip("/")
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._session = None
+
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    @property
+    def session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+    async def request(self, method, path, idempotent=True, **kwargs):
+        """
+        Perform a gateway call and return the decoded JSON body, with the same
+        retry rules as `GatewayClient.request`.
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        route = gateway_route(path)
+        attempt = 0
+
+        while True:
+            self.requests += 1
+            started = time.perf_counter()
+            try:
+                async with self.session.request(method, url, **kwargs) as response:
+                    if response.status == 200:
+                        data = await response.json(content_type=None)
+                        GATEWAY_LATENCY.observe(time.perf_counter() - started, route=route, method=method)
+                        GATEWAY_REQUESTS.inc(route=route, method=method, outcome="ok")
+                        return data
+                    error = GatewayError(await _error_message(response), response.status)
+                    retryable = idempotent and response.status in RETRY_STATUS_CODES
+                    outcome = f"http_{response.status}"
+            except aiohttp.ClientConnectionError as e:
+                error, retryable, outcome = GatewayError(f"Gateway unreachable: {e}"), True, "unreachable"
+            except asyncio.TimeoutError as e:
+                error, retryable, outcome = GatewayError(f"Gateway timed out: {e!r}"), idempotent, "timeout"
+            GATEWAY_LATENCY.observe(time.perf_counter() - started, route=route, method=method)
+            GATEWAY_REQUESTS.inc(route=route, method=method, outcome=outcome)
+
+            if not retryable or attempt >= self.max_retries:
+                self.failures += 1
+                raise error
+
+            self.retries += 1
+            GATEWAY_RETRIES.inc(route=route, method=method)
+            await asyncio.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+            attempt += 1
+
+    async def get(self, path, **kwargs):
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path, payload, idempotent=False, **kwargs):
+        return await self.request("POST", path, idempotent=idempotent, json=payload, **kwargs)
+
+    async def get_transaction(self, tx_hash, with_results=True):
+        return await self.get(f"transaction/{tx_hash}", params={"withResults": "true" if with_results else "false"})
+
+    async def get_account_nonce(self, address):
+        data = await self.get(f"address/{address.to_bech32()}")
+        return data["data"]["account"]["nonce"]
+
+    async def send_transaction(self, tx):
+        data = await self.post("transaction/send", tx.to_dictionary())
+        return data["data"]["txHash"]
+
+    async def query_contract(self, contract, function, arguments=(), caller=None):
+        payload = {"scAddress": contract, "funcName": function, "args": list(arguments)}
+        if caller:
+            payload["caller"] = caller
+
+        data = (await self.post("vm-values/query", payload, idempotent=True))["data"]["data"]
+        if data.get("returnCode") != "ok":
+            raise ContractQueryError(function, data.get("returnCode"), data.get("returnMessage"))
+        return data.get("returnData") or []
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "connection_limit": self.limit,
+        }
+
+
+async def _error_message(response):
+    try:
+        message = (await response.json(content_type=None)).get("error")
+    except (ValueError, aiohttp.ContentTypeError):
+        message = None
+    return message or f"Gateway returned HTTP {response.status}"
@@ -1,63 +1,304 @@
-from flask import Flask, jsonify, request
-import requests
+from flask import Flask, Response, g, jsonify, request
+from multiversx_sdk import Address
+from pathlib import Path
+import os
 import time
-from multiversx_sdk import (
-    ProxyNetworkProvider,
-    Address,
-    UserSigner,
-    TransactionComputer,
-    TransactionsFactoryConfig,
-    SmartContractTransactionsFactory,
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
+from cache import TxResultCache
+from codec import decode_operations, decode_transaction, from_hex, grade_answers, summarize_feedback
+from contract_views import ContractViews
+from config_registry import ConfigRegistry, ConfigurationError
+from confirmation import (
+    TransactionFailed,
+    TransactionTimeout,
+    wait_for_transaction,
+    wait_for_transactions,
 )
-from pathlib import Path
-import subprocess
+from gateway import GatewayClient
+from indexer import ContractIndexer
+from jobs import JobManager
+from metrics import CONTENT_TYPE, registry
+from nonces import NonceManager
+from preflight import Preflight, PreflightRejected
+from scheduler import BULK, CONFIRM, SEND, UpstreamScheduler
+from scores import ScoreBoard
+from singleflight import SingleFlight
 
 # Flask app initialization
 app = Flask(__name__)
 
 # Configuration
-PROXY_URL = "https://devnet-gateway.multiversx.com"
+# The gateway can be overridden, e.g. to point at a local mock_gateway.py.
+# A comma-separated list spreads calls over several gateways (see GatewayClient).
+PROXY_URL = os.environ.get("PROXY_URL", "https://devnet-gateway.multiversx.com")
+# Transaction listings come from the API, which indexes the gateway's data
+API_URL = os.environ.get("API_URL", "https://devnet-api.multiversx.com")
 CHAIN_ID = "D"
 
+# Transaction confirmation polling (seconds)
+CONFIRMATION_TIMEOUT = 90
+CONFIRMATION_INITIAL_DELAY = 1.0
+CONFIRMATION_MAX_DELAY = 6.0
+CONFIRMATION_BACKOFF = 1.5
+
+# Upstream rate limits in calls per second (0: unlimited); set them to the quota of the gateway and API
+GATEWAY_RATE_LIMIT = float(os.environ.get("GATEWAY_RATE_LIMIT", "0"))
+GATEWAY_BURST = float(os.environ.get("GATEWAY_BURST", "0")) or None
+API_RATE_LIMIT = float(os.environ.get("API_RATE_LIMIT", "0"))
+API_BURST = float(os.environ.get("API_BURST", "0")) or None
+# Every upstream call waits for a token here; sends and confirmation polls go ahead of bulk reads
+gateway_scheduler = UpstreamScheduler("gateway", rate=GATEWAY_RATE_LIMIT, burst=GATEWAY_BURST)
+api_scheduler = UpstreamScheduler("api", rate=API_RATE_LIMIT, burst=API_BURST)
+
+# Worker pools making gateway calls (see the batch and job sections below)
+BATCH_MAX_WORKERS = 16
+JOB_MAX_WORKERS = 64
+# Keep-alive connections per gateway: one per worker plus headroom for request threads
+GATEWAY_POOL_SIZE = BATCH_MAX_WORKERS + JOB_MAX_WORKERS + 32
+
+# Shared gateway client (pooled keep-alive connections, bounded retries, failover between gateways)
+gateway = GatewayClient(PROXY_URL, pool_maxsize=GATEWAY_POOL_SIZE, scheduler=gateway_scheduler)
+
+# Contract configurations registered through /set_config
+configs = ConfigRegistry(CHAIN_ID, gateway)
+
+# Concurrent identical upstream lookups share one call
+coalescer = SingleFlight()
+
+# Account nonces handed out locally (seeded once per sender from the gateway, right before a send)
+nonce_manager = NonceManager(gateway_scheduler.bind(SEND, gateway.get_account_nonce))
+
+# Decoded transaction results (finalized entries never expire)
+TX_CACHE_MAX_BYTES = 16 * 1024 * 1024
+TX_CACHE_PENDING_TTL = 3.0
+# Final results are also kept on disk across restarts; an empty TX_CACHE_PATH keeps them in memory only
+TX_CACHE_PATH = os.environ.get("TX_CACHE_PATH", "tx_cache.sqlite3")
+tx_cache = TxResultCache(max_bytes=TX_CACHE_MAX_BYTES, pending_ttl=TX_CACHE_PENDING_TTL, disk_path=Path(TX_CACHE_PATH) if TX_CACHE_PATH else None)
+
+# Contract view queries (short per-user cache, invalidated on submit)
+VIEW_CACHE_TTL = 10.0
+contract_views = ContractViews(gateway, ttl=VIEW_CACHE_TTL)
+
+# Dry runs of generate_test / submit_test before sending (outcomes cached per caller)
+PREFLIGHT_TTL = 5.0
+preflight = Preflight(gateway, ttl=PREFLIGHT_TTL)
+
+# Batch lookups (bounded worker pool shared by all batch requests)
+BATCH_MAX_SIZE = 500
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS, thread_name_prefix="batch")
+
+# Background jobs (confirmation of transactions sent with "async": true)
+JOB_RETENTION = 600.0
+jobs = JobManager(max_workers=JOB_MAX_WORKERS, retention=JOB_RETENTION)
+
+# Bulk sends (transactions per /transaction/send-multiple call)
+BULK_SEND_CHUNK_SIZE = 100
+
+# Local index of the configured contracts' transactions (followed from the API)
+INDEXER_DB_PATH = Path(os.environ.get("INDEXER_DB_PATH", "indexer.sqlite3"))
+INDEXER_POLL_INTERVAL = 5.0
+INDEXER_PAGE_SIZE = 50
+api = GatewayClient(API_URL, scheduler=api_scheduler)
+
+# Class-wide scores, updated from observed transactions and reconciled with the contract
+SCORES_RECONCILE_INTERVAL = 60.0
+LEADERBOARD_MAX_PAGE_SIZE = 500
+scoreboard = ScoreBoard(INDEXER_DB_PATH, gateway_scheduler.bind(BULK, contract_views.refresh), reconcile_interval=SCORES_RECONCILE_INTERVAL, map_fn=batch_executor.map)
+
+# Operations of every student's unsubmitted test, for provisional grading: (contract, sender) -> operations
+open_tests = {}
+
+indexer = ContractIndexer(
+    api_scheduler.bind(BULK, api.get_account_transactions),
+    INDEXER_DB_PATH,
+    poll_interval=INDEXER_POLL_INTERVAL,
+    page_size=INDEXER_PAGE_SIZE,
+    on_indexed=scoreboard.observe,
+)
+
+# Metrics exposed on /metrics (gateway and signing metrics live in their modules)
+HTTP_REQUESTS = registry.counter("http_requests_total", "Handled API requests by endpoint and status.", ("endpoint", "method", "status"))
+HTTP_LATENCY = registry.histogram("http_request_duration_seconds", "API request latency by endpoint.", ("endpoint", "method"))
+HTTP_IN_FLIGHT = registry.gauge("http_requests_in_flight", "API requests currently being handled.")
+DECODE_LATENCY = registry.histogram("result_decode_duration_seconds", "Time spent decoding smart contract results.")
+CONFIRMATION_WAIT = registry.histogram("confirmation_wait_seconds", "Time from send until a transaction is final, by outcome.", ("outcome",))
+PROVISIONAL_GRADES = registry.counter("provisional_grades_total", "Provisional grades checked against on-chain feedback, by outcome.", ("outcome",))
+TX_IN_FLIGHT = registry.gauge("transactions_in_flight", "Sent transactions whose confirmation is being awaited.")
+
+registry.callback("tx_cache_hits_total", "Transaction result cache hits.", lambda: tx_cache.stats()["hits"], type="counter")
+registry.callback("tx_cache_misses_total", "Transaction result cache misses.", lambda: tx_cache.stats()["misses"], type="counter")
+registry.callback("tx_cache_disk_hits_total", "Transaction result cache hits served from disk.", lambda: tx_cache.stats()["disk_hits"], type="counter")
+registry.callback("tx_cache_evictions_total", "Transaction result cache evictions.", lambda: tx_cache.stats()["evictions"], type="counter")
+registry.callback("tx_cache_hit_ratio", "Transaction result cache hit ratio.", lambda: tx_cache.stats()["hit_ratio"])
+registry.callback("tx_cache_bytes", "Approximate size of the in-memory transaction result cache.", lambda: tx_cache.stats()["bytes"])
+registry.callback("jobs", "Background jobs by status.", lambda: jobs.stats(), labels=("status",))
+registry.callback("indexer_transactions", "Transactions in the local index.", lambda: indexer.transactions)
+registry.callback("indexer_lookups_total", "Local index lookups by result.", lambda: {"hit": indexer.hits, "miss": indexer.misses}, type="counter", labels=("result",))
+registry.callback("indexer_errors_total", "Failed indexer passes over a contract.", lambda: indexer.errors, type="counter")
+registry.callback("scoreboard_corrections_total", "Stored scores corrected by reconciliation with the contract.", lambda: scoreboard.stats()["corrections"], type="counter")
+registry.callback("preflight_checks_total", "Pre-flight checks of contract calls.", lambda: preflight.stats()["checks"], type="counter")
+registry.callback("preflight_rejections_total", "Contract calls rejected by pre-flight checks instead of being sent.", lambda: preflight.stats()["rejections"], type="counter")
+registry.callback(
+    "upstream_queue_depth",
+    "Upstream calls waiting for a rate limit token, by priority.",
+    lambda: {
+        (scheduler.name, priority): depth
+        for scheduler in (gateway_scheduler, api_scheduler)
+        for priority, depth in scheduler.queue_depths().items()
+    },
+    labels=("upstream", "priority"),
+)
+registry.callback("nonce_resyncs_total", "Local nonces resynchronized from the gateway.", lambda: nonce_manager.stats()["resyncs"], type="counter")
+
+
+def confirmation_outcome(error):
+    if error is None:
+        return "success"
+    return "timeout" if isinstance(error, TransactionTimeout) else "failed"
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    HTTP_IN_FLIGHT.inc()
+
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    HTTP_LATENCY.observe(time.perf_counter() - g.request_started, endpoint=endpoint, method=request.method)
+    HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    return response
+
+
+@app.teardown_request
+def finish_request(error):
+    if "request_started" in g:
+        HTTP_IN_FLIGHT.dec()
+
+
 @app.route("/set_config", methods=["POST"])
 def set_config():
     """
-    Set the contract address and wallet PEM dynamically from the frontend.
+    Register a contract address and wallet PEM dynamically from the frontend.
+    Several contracts (and wallets) can be configured side by side; requests
+    select one with `contract_address` / `wallet_address`, which may only be
+    left out while a single configuration matches.
     """
-    global CONTRACT_ADDRESS, WALLET_PEM_PATH, wallet_signer, proxy, contract_address, transaction_computer, transactions_factory
     try:
         data = request.json
-        CONTRACT_ADDRESS = data["contract_address"]
-        wallet_pem_content = data["wallet_pem"]
-
-        # Save wallet PEM to a temporary file
-        WALLET_PEM_PATH = Path("dynamic_wallet.pem")
-        with WALLET_PEM_PATH.open("w") as pem_file:
-            pem_file.write(wallet_pem_content)
-
-        # SDK Initialization
-        proxy = ProxyNetworkProvider(PROXY_URL)
-        contract_address = Address.from_bech32(CONTRACT_ADDRESS)
-        wallet_signer = UserSigner.from_pem_file(Path(WALLET_PEM_PATH))
-        transaction_computer = TransactionComputer()
-        transactions_factory = SmartContractTransactionsFactory(
-            TransactionsFactoryConfig(chain_id=CHAIN_ID)
-        )
+        config = configs.register(data["contract_address"], data["wallet_pem"])
+        indexer.follow(config.contract_address)
+        scoreboard.follow(config.contract_address)
 
-        return jsonify({"message": "Configuration set successfully."}), 200
+        return jsonify({
+            "message": "Configuration set successfully.",
+            "contract_address": config.contract_address,
+            "wallet_address": config.wallet_address
+        }), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/configs", methods=["GET"])
+def list_configs():
+    """
+    Lists the registered (contract, wallet) configurations.
+    """
+    return jsonify({"configs": configs.list()}), 200
+
+
+def request_config():
+    """
+    Select the configuration of the current request from its
+    `contract_address` and `wallet_address` (JSON body or query string).
+    """
+    data = request.get_json(silent=True) or {}
+    contract = data.get("contract_address") or request.args.get("contract_address")
+    wallet = data.get("wallet_address") or request.args.get("wallet_address")
+    return configs.get(contract, wallet)
+
+
+def request_contract_address():
+    """
+    Resolve the contract of the current request from its `contract_address` (JSON body or query string).
+    """
+    data = request.get_json(silent=True) or {}
+    return configs.contract_address(data.get("contract_address") or request.args.get("contract_address"))
+
+
 def fetch_transaction_data(tx_hash):
     """
     Fetch transaction data from the MultiversX Gateway API.
+    Concurrent fetches of the same transaction share one gateway call.
+    """
+    return coalescer.do("transaction", tx_hash, lambda: gateway.get_transaction(tx_hash))
+
+
+def resync_after_timeout(sender_address_str):
+    """
+    Forget a sender's local nonce after one of its transactions did not confirm in time.
+    A dropped or stuck transaction leaves a nonce gap that no later send reports as a nonce error.
+    """
+    nonce_manager.resync(Address.from_bech32(sender_address_str))
+
+
+# Confirmation polls go ahead of ordinary reads
+poll_transaction_data = gateway_scheduler.bind(CONFIRM, fetch_transaction_data)
+
+
+def wait_for_confirmation(tx_hash, sender_address_str=None):
+    """
+    Wait until a sent transaction and its smart contract results are final.
+    If it times out, the local nonce of `sender_address_str` is resynchronized.
+    """
+    started = time.perf_counter()
+    error = None
+    try:
+        with TX_IN_FLIGHT.track_inprogress():
+            return wait_for_transaction(
+                poll_transaction_data,
+                tx_hash,
+                timeout=CONFIRMATION_TIMEOUT,
+                initial_delay=CONFIRMATION_INITIAL_DELAY,
+                max_delay=CONFIRMATION_MAX_DELAY,
+                backoff=CONFIRMATION_BACKOFF,
+            )
+    except TransactionTimeout as e:
+        error = e
+        if sender_address_str is not None:
+            resync_after_timeout(sender_address_str)
+        raise
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        CONFIRMATION_WAIT.observe(time.perf_counter() - started, outcome=confirmation_outcome(error))
+
+
+def preflight_error_response(error):
+    """
+    Build the JSON error response for a call the contract would reject.
+    """
+    return jsonify({"error": str(error), "status": "rejected", "reason": error.reason}), 409
+
+
+def confirmation_error_response(error):
+    """
+    Build the JSON error response for a transaction that did not confirm.
+    """
+    if isinstance(error, TransactionTimeout):
+        return jsonify({"error": str(error), "status": "timeout", "tx_hash": error.tx_hash}), 504
+    return jsonify({"error": str(error), "status": error.status, "reason": error.reason, "tx_hash": error.tx_hash}), 422
+
+
+def send_with_local_nonce(config, sender_address, tx):
     """
-    url = f"{PROXY_URL}/transaction/{tx_hash}?withResults=true"
-    response = requests.get(url)
-    if response.status_code != 200:
-        raise ValueError("Failed to fetch transaction data.")
-    return response.json()
+    Sign and send a transaction under the sender's next local nonce.
+    The nonce is resynchronized from the gateway if the send is rejected because of it.
+    """
+    return nonce_manager.send(sender_address, lambda nonce: config.gateway.send_transaction(config.sign(tx, nonce)))
 
 
 def parse_operations(hex_data):
@@ -65,77 +306,215 @@ def parse_operations(hex_data):
     Decode a hex string of operations into a readable array of operations.
     Each operation is 6 bytes long.
     """
-    operations = []
-    for i in range(0, len(hex_data), 12):  # Each operation is 12 characters (6 bytes)
-        segment = hex_data[i:i + 12]
-        if len(segment) < 12:
-            break
+    return decode_operations(from_hex(hex_data))
+
+
+class NoResultsError(ValueError):
+    """
+    Raised when a confirmed transaction carries no smart contract results.
+    """
+
+
+def wants_async():
+    """
+    Whether the client asked for the job API instead of waiting for confirmation.
+    """
+    return bool((request.json or {}).get("async")) or request.args.get("async") in ("1", "true")
+
+
+def wants_provisional():
+    """
+    Whether the client asked for answers to be graded locally before confirmation.
+    """
+    return bool((request.json or {}).get("provisional")) or request.args.get("provisional") in ("1", "true")
+
+
+def job_accepted_response(job, **extra):
+    return jsonify({
+        **job.to_dict(),
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/{job.id}/events",
+        **extra,
+    }), 202
 
-        # Decode operands and operator
-        operand1 = int(segment[0:2], 16)
-        operator = chr(int(segment[4:6], 16))  # Decode ASCII operator
-        operand2 = int(segment[8:10], 16)
 
-        # Map operator to human-readable format
-        operator_display = {
-            "+": "+",
-            "-": "-",
-            "*": "*",
-            "/": "/",
-        }.get(operator, "unknown")
+def send_generate_test(config, sender_address_str):
+    """
+    Build, sign and send a `generate_test` transaction for a sender.
+
+    :return: The transaction hash.
+    """
+    sender_address = Address.from_bech32(sender_address_str)
 
-        # Compose the full operation as a string
-        operation_string = f"{operand1} {operator_display} {operand2}"
+    # Fail fast if the contract would reject the call
+    preflight.check(config.contract_address, sender_address_str, "generate_test")
 
-        operations.append({
-            "hex_segment": segment,
-            "operand1": operand1,
-            "operator": operator_display,
-            "operand2": operand2,
-            "operation": operation_string
-        })
+    # Generate test transaction
+    tx = config.create_call(sender_address, "generate_test")
 
-    return operations
+    # Sign and send transaction with a locally assigned nonce
+    tx_hash = send_with_local_nonce(config, sender_address, tx)
+    preflight.sent(config.contract_address, sender_address_str)
+    return tx_hash
+
+
+def finish_generate_test(config, sender_address_str, tx_hash):
+    """
+    Wait for a `generate_test` transaction and decode the generated operations.
+    """
+    # Wait for the transaction and its results to be final
+    try:
+        data = wait_for_confirmation(tx_hash, sender_address_str)
+    finally:
+        preflight.settled(config.contract_address, sender_address_str)
+
+    # Extract operations
+    record = cache_transaction_results(tx_hash, data)
+    scoreboard.observe(config.contract_address, "generate_test", sender_address_str, tx_hash, record)
+    operations = record["operations"]
+    if operations is None:
+        raise NoResultsError("No smart contract results found")
+    open_tests[(config.contract_address, sender_address_str)] = operations
+
+    return {"message": "Test generated and operations fetched successfully", "tx_hash": tx_hash, "operations": operations}
 
 
 @app.route("/generate_and_get_operations", methods=["POST"])
 def generate_and_get_operations():
     """
     Combines generating a test and fetching operations in a single endpoint.
+    With `"async": true` the job id and tx hash are returned right after sending
+    and the confirmation runs in the background (see `/jobs/<job_id>`).
     """
     try:
+        config = request_config()
         sender_address_str = request.json["sender_address"]
-        sender_address = Address.from_bech32(sender_address_str)
-        account = proxy.get_account(sender_address)
-
-        # Generate test transaction
-        tx = transactions_factory.create_transaction_for_execute(
-            sender=sender_address,
-            contract=contract_address,
-            function="generate_test",
-            gas_limit=5_000_000,
-        )
-        tx.nonce = account.nonce
-        bytes_to_sign = transaction_computer.compute_bytes_for_signing(tx)
-        tx.signature = wallet_signer.sign(bytes_to_sign)
-
-        # Send transaction
-        tx_hash = proxy.send_transaction(tx)
-        time.sleep(30)  # Wait for the transaction to process
-
-        # Fetch transaction data
-        data = fetch_transaction_data(tx_hash)
-
-        # Extract operations
-        sc_results = data["data"]["transaction"].get("smartContractResults", [])
-        if not sc_results:
-            return jsonify({"error": "No smart contract results found"}), 404
+        tx_hash = send_generate_test(config, sender_address_str)
+
+        if wants_async():
+            return job_accepted_response(jobs.submit("generate_test", lambda: finish_generate_test(config, sender_address_str, tx_hash), tx_hash))
+
+        return jsonify(finish_generate_test(config, sender_address_str, tx_hash)), 200
+    except ConfigurationError as e:
+        return jsonify({"error": str(e)}), 400
+    except PreflightRejected as e:
+        return preflight_error_response(e)
+    except NoResultsError as e:
+        return jsonify({"error": str(e)}), 404
+    except (TransactionTimeout, TransactionFailed) as e:
+        return confirmation_error_response(e)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-        raw_data = sc_results[0]["data"].split("@")[-1]
-        print(raw_data)
-        operations = parse_operations(raw_data)
 
-        return jsonify({"message": "Test generated and operations fetched successfully", "tx_hash": tx_hash, "operations": operations}), 200
+@app.route("/bulk_generate_tests", methods=["POST"])
+def bulk_generate_tests():
+    """
+    Generates a test for every sender of a cohort in batched sends and returns all operations.
+    Each sender's wallet must have been registered for the contract with `/set_config`.
+    """
+    try:
+        sender_addresses = (request.json or {}).get("sender_addresses")
+        if not isinstance(sender_addresses, list) or not sender_addresses:
+            return jsonify({"error": "Missing 'sender_addresses' list"}), 400
+        if len(sender_addresses) > BATCH_MAX_SIZE:
+            return jsonify({"error": f"At most {BATCH_MAX_SIZE} senders per request"}), 400
+
+        contract_address = request_contract_address()
+        results = {sender: {"sender_address": sender} for sender in dict.fromkeys(sender_addresses)}
+
+        # Every transaction is signed by its sender's own registered wallet
+        sender_configs = {}
+        for sender in results:
+            try:
+                sender_configs[sender] = configs.get(contract_address, sender)
+            except ConfigurationError:
+                results[sender].update(error="No wallet registered for this sender.", status="unconfigured")
+
+        # Dry-run every sender's call first; senders the contract would reject are not sent
+        def check(sender):
+            try:
+                preflight.check(contract_address, sender, "generate_test")
+            except PreflightRejected as e:
+                results[sender].update(error=str(e), status="rejected")
+                return False
+            return True
+
+        allowed = [sender for sender, ok in zip(sender_configs, batch_executor.map(check, sender_configs)) if ok]
+
+        # Build and sign one generate_test transaction per sender; unseeded nonces are read concurrently
+        def build(sender):
+            try:
+                config = sender_configs[sender]
+                sender_address = Address.from_bech32(sender)
+                tx = config.create_call(sender_address, "generate_test")
+                return sender, sender_address, config.sign(tx, nonce_manager.next_nonce(sender_address))
+            except Exception as e:
+                results[sender]["error"] = str(e)
+                return None
+
+        signed = [item for item in batch_executor.map(build, allowed) if item is not None]
+
+        # Send them in batched gateway calls
+        hashes = {}
+        for start in range(0, len(signed), BULK_SEND_CHUNK_SIZE):
+            chunk = signed[start:start + BULK_SEND_CHUNK_SIZE]
+            try:
+                tx_hashes = gateway.send_transactions([tx for _, _, tx in chunk])
+            except Exception as e:
+                tx_hashes = [None] * len(chunk)
+                for sender, _, _ in chunk:
+                    results[sender]["error"] = str(e)
+
+            for (sender, sender_address, tx), tx_hash in zip(chunk, tx_hashes):
+                if tx_hash is None:
+                    # Rejected or never sent: the local nonce can no longer be trusted
+                    nonce_manager.resync(sender_address)
+                    results[sender].setdefault("error", "Transaction rejected by the gateway")
+                    continue
+                results[sender]["tx_hash"] = tx_hash
+                hashes[tx_hash] = sender
+                preflight.sent(contract_address, sender)
+
+        # Wait for all of them together
+        started = time.perf_counter()
+        TX_IN_FLIGHT.inc(len(hashes))
+        try:
+            outcomes = wait_for_transactions(
+                poll_transaction_data,
+                list(hashes),
+                timeout=CONFIRMATION_TIMEOUT,
+                initial_delay=CONFIRMATION_INITIAL_DELAY,
+                max_delay=CONFIRMATION_MAX_DELAY,
+                backoff=CONFIRMATION_BACKOFF,
+                map_fn=batch_executor.map,
+            )
+        finally:
+            TX_IN_FLIGHT.dec(len(hashes))
+            for sender in hashes.values():
+                preflight.settled(contract_address, sender)
+        waited = time.perf_counter() - started
+        for tx_hash, outcome in outcomes.items():
+            CONFIRMATION_WAIT.observe(waited, outcome=confirmation_outcome(outcome if isinstance(outcome, Exception) else None))
+            item = results[hashes[tx_hash]]
+            if isinstance(outcome, Exception):
+                item["error"] = str(outcome)
+                item["status"] = "timeout" if isinstance(outcome, TransactionTimeout) else outcome.status
+                if isinstance(outcome, TransactionTimeout):
+                    resync_after_timeout(hashes[tx_hash])
+                continue
+            record = cache_transaction_results(tx_hash, outcome)
+            scoreboard.observe(contract_address, "generate_test", hashes[tx_hash], tx_hash, record)
+            operations = record["operations"]
+            if operations is None:
+                item["error"] = "No smart contract results found"
+            else:
+                item["operations"] = operations
+                open_tests[(contract_address, hashes[tx_hash])] = operations
+
+        return jsonify({"results": list(results.values())}), 200
+    except ConfigurationError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -150,18 +529,11 @@ def get_operations():
         if not tx_hash:
             return jsonify({"error": "Missing 'tx_hash' parameter"}), 400
 
-        # Fetch transaction data
-        data = fetch_transaction_data(tx_hash)
-
-        # Extract operations
-        sc_results = data["data"]["transaction"].get("smartContractResults", [])
-        if not sc_results:
+        # Fetch (or reuse) the decoded transaction results
+        operations = get_transaction_results(tx_hash)["operations"]
+        if operations is None:
             return jsonify({"error": "No smart contract results found"}), 404
 
-        raw_data = sc_results[0]["data"].split("@")[-1]
-        print(raw_data)
-        operations = parse_operations(raw_data)
-
         return jsonify({"operations": operations}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -197,72 +569,241 @@ def extract_correct_answers(tx_hash):
     :return: Count of correct answers.
     """
     try:
-        # Fetch transaction data
-        url = f"{PROXY_URL}/transaction/{tx_hash}?withResults=true"
-        response = requests.get(url)
-
-        if response.status_code != 200:
-            raise ValueError("Failed to fetch transaction data")
-
-        data = response.json()
-        sc_results = data["data"]["transaction"].get("smartContractResults", [])
-        if not sc_results:
+        # Fetch (or reuse) the decoded transaction results
+        correct_count = get_transaction_results(tx_hash)["correct_answers"]
+        if correct_count is None:
             raise ValueError("No smart contract results found")
 
-        # Extract the data field and count occurrences of "Correct"
-        correct_marker = "436f72726563740000000000"
-        correct_count = sum(result["data"].count(correct_marker) for result in sc_results if "data" in result)
-
         return correct_count
     except Exception as e:
-        print(f"Error extracting correct answers: {e}")
+        app.logger.warning("Error extracting correct answers: %s", e)
         return 0
 
+def decode_transaction_results(data):
+    """
+    Decode the operations and feedback carried by a transaction's smart contract results.
+
+    :param data: Transaction data as returned by the gateway.
+    :return: Dict with the transaction status, finality, operations and per-question feedback.
+    """
+    with DECODE_LATENCY.time():
+        return decode_transaction(data["data"]["transaction"])
+
+def cache_transaction_results(tx_hash, data):
+    """
+    Decode already fetched transaction data and store it in the result cache.
+    """
+    record = decode_transaction_results(data)
+    tx_cache.put(tx_hash, record, final=record["final"])
+    return record
+
+def lookup_local_results(tx_hash):
+    """
+    Decoded results of a transaction from the in-memory cache, else from the local index
+    (keeping index hits in memory for the next lookup), or None.
+    """
+    record = tx_cache.get(tx_hash)
+    if record is None:
+        record = indexer.lookup(tx_hash)
+        if record is not None:
+            # Indexed transactions are final and already on disk
+            tx_cache.put(tx_hash, record, final=True, persist=False)
+    return record
+
+
+def get_transaction_results(tx_hash):
+    """
+    Return the decoded results of a transaction from the cache or the local index,
+    fetching from the gateway only for transactions that are in neither.
+    """
+    record = lookup_local_results(tx_hash)
+    if record is None:
+        # A burst of lookups of the same uncached transaction is fetched and decoded once
+        record = coalescer.do("transaction_results", tx_hash, lambda: cache_transaction_results(tx_hash, fetch_transaction_data(tx_hash)))
+    return record
+
+
+def send_submit_test(config, sender_address_str, answers):
+    """
+    Build, sign and send a `submit_test` transaction with the sender's answers.
+
+    :return: The transaction hash.
+    """
+    # Convert answers to hex and pad with "00"
+    answers_hex = answers_to_hex(answers)
+    app.logger.debug("submit_test answers: %s", answers_hex)
+
+    sender_address = Address.from_bech32(sender_address_str)
+
+    # Fail fast if the contract would reject the call
+    preflight.check(config.contract_address, sender_address_str, "submit_test", [answers_hex])
+
+    # Submit test transaction
+    tx = config.create_call(sender_address, "submit_test", arguments=[bytes.fromhex(answers_hex)])
+
+    # Sign and send transaction with a locally assigned nonce
+    tx_hash = send_with_local_nonce(config, sender_address, tx)
+    preflight.sent(config.contract_address, sender_address_str)
+    scoreboard.submitted(config.contract_address, sender_address_str, tx_hash)
+    return tx_hash
+
+
+def open_test_operations(config, sender_address_str, generate_tx_hash=None):
+    """
+    Operations of a student's unsubmitted test: those of `generate_tx_hash` if given, else
+    the last test generated through this backend, else the last indexed test without a submission.
+
+    :return: List of decoded operations, or None if the test is unknown.
+    """
+    if generate_tx_hash:
+        return get_transaction_results(generate_tx_hash)["operations"]
+
+    operations = open_tests.get((config.contract_address, sender_address_str))
+    if operations is not None:
+        return operations
+
+    tests = indexer.tests(sender_address_str, config.contract_address)
+    if tests and tests[-1]["submit_tx_hash"] is None:
+        return tests[-1]["operations"]
+    return None
+
+
+def provisional_result(feedback):
+    """
+    Response body of a provisional grade.
+    """
+    summary = summarize_feedback(feedback)
+    return {
+        "correct_answers": f"{summary['correct_answers']}/5 correct answers",
+        "wrong_questions": summary["wrong_questions"],
+        "feedback": feedback,
+    }
+
+
+def finish_submit_test(config, sender_address_str, tx_hash, provisional=None):
+    """
+    Wait for a `submit_test` transaction and decode the feedback.
+    With a provisional (locally graded) feedback, also report where it disagrees with the contract.
+    """
+    # Wait for the transaction and its results to be final
+    try:
+        data = wait_for_confirmation(tx_hash, sender_address_str)
+    except TransactionFailed:
+        # A failed submission never reaches the contract's score
+        scoreboard.settled(config.contract_address, sender_address_str, tx_hash)
+        raise
+    finally:
+        preflight.settled(config.contract_address, sender_address_str)
+    open_tests.pop((config.contract_address, sender_address_str), None)
+
+    # The cached score is stale once the submission is final
+    contract_views.invalidate(config.contract_address, sender_address_str)
+
+    record = cache_transaction_results(tx_hash, data)
+    scoreboard.observe(config.contract_address, "submit_test", sender_address_str, tx_hash, record)
+    correct_answers = record["correct_answers"]
+    if correct_answers is None:
+        raise NoResultsError("No smart contract results found")
+
+    result = {
+        "message": "Test submitted successfully",
+        "tx_hash": tx_hash,
+        "correct_answers": f"{correct_answers}/5 correct answers",
+        "wrong_questions": record["wrong_questions"]
+    }
+
+    if provisional is not None:
+        mismatched = [
+            local["question"]
+            for local, on_chain in zip(provisional, record["feedback"])
+            if local["correct"] != on_chain["correct"]
+        ]
+        if mismatched:
+            app.logger.warning("Provisional grade of %s disagrees with the contract on questions %s", tx_hash, mismatched)
+        PROVISIONAL_GRADES.inc(outcome="mismatch" if mismatched else "match")
+        result["provisional_mismatch"] = bool(mismatched)
+        result["mismatched_questions"] = mismatched
+
+    return result
+
 
 @app.route("/submit_test", methods=["POST"])
 def submit_test():
     """
     Submits answers for the math test as a hex string with a `00` padding.
+    With `"async": true` the job id and tx hash are returned right after sending
+    and the confirmation runs in the background (see `/jobs/<job_id>`).
+    With `"provisional": true` the answers are also graded locally against the
+    open test (optionally named by `generate_tx_hash`) and that grade is returned
+    at once, together with the job; the job result flags any disagreement with
+    the on-chain feedback. The provisional grade is null if the test is unknown.
     """
     try:
         sender_address_str = request.json["sender_address"]
         answers = request.json["answers"]  # Example: [1, 2, 3, 4, 5]
 
-        # Convert answers to hex and pad with "00"
-        answers_hex = answers_to_hex(answers)
-
-        print(answers_hex)
-
-        sender_address = Address.from_bech32(sender_address_str)
-        account = proxy.get_account(sender_address)
-
-        # Submit test transaction
-        tx = transactions_factory.create_transaction_for_execute(
-            sender=sender_address,
-            contract=contract_address,
-            function="submit_test",
-            arguments=[bytes.fromhex(answers_hex)],
-            gas_limit=5_000_000,
-        )
-        tx.nonce = account.nonce
-        bytes_to_sign = transaction_computer.compute_bytes_for_signing(tx)
-        tx.signature = wallet_signer.sign(bytes_to_sign)
+        config = request_config()
+
+        provisional = None
+        if wants_provisional():
+            # The provisional grade is optional; failing to compute it must not block the submission
+            try:
+                operations = open_test_operations(config, sender_address_str, request.json.get("generate_tx_hash"))
+                if operations is not None:
+                    provisional = grade_answers(operations, answers)
+            except Exception as e:
+                app.logger.warning("Provisional grading of %s's submission failed: %s", sender_address_str, e)
+
+        tx_hash = send_submit_test(config, sender_address_str, answers)
+
+        if wants_provisional():
+            job = jobs.submit("submit_test", lambda: finish_submit_test(config, sender_address_str, tx_hash, provisional), tx_hash)
+            return job_accepted_response(job, provisional=provisional_result(provisional) if provisional is not None else None)
+
+        if wants_async():
+            return job_accepted_response(jobs.submit("submit_test", lambda: finish_submit_test(config, sender_address_str, tx_hash), tx_hash))
+
+        return jsonify(finish_submit_test(config, sender_address_str, tx_hash)), 200
+    except ConfigurationError as e:
+        return jsonify({"error": str(e)}), 400
+    except PreflightRejected as e:
+        return preflight_error_response(e)
+    except NoResultsError as e:
+        return jsonify({"error": str(e)}), 404
+    except (TransactionTimeout, TransactionFailed) as e:
+        return confirmation_error_response(e)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-         # Send transaction
-        tx_hash = proxy.send_transaction(tx)
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """
+    Returns the state of a background job (and its result once it succeeded).
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify(job.to_dict()), 200
 
-        # Wait for the transaction to be processed
-        time.sleep(30)
+@app.route("/jobs/<job_id>/events", methods=["GET"])
+def job_events(job_id):
+    """
+    Streams the state changes of a background job as server-sent events.
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return Response(jobs.events(job), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
 
-        # Fetch transaction data
-        correct_answers = extract_correct_answers(tx_hash)
-        return jsonify({
-            "message": "Test submitted successfully",
-            "tx_hash": tx_hash,
-            "correct_answers": f"{correct_answers}/5 correct answers"
-        }), 200
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+@app.route("/get_tests", methods=["GET"])
+def get_tests():
+    """
+    Lists the indexed tests of a student (operations and feedback per test number).
+    """
+    sender_address = request.args.get("sender_address")
+    if not sender_address:
+        return jsonify({"error": "Missing 'sender_address' parameter"}), 400
+    return jsonify({"sender_address": sender_address, "tests": indexer.tests(sender_address, request.args.get("contract_address"))}), 200
 
 @app.route("/get_correct_answers", methods=["GET"])
 def get_correct_answers():
@@ -285,10 +826,132 @@ def get_correct_answers():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def batch_operations_item(tx_hash):
+    """
+    Batch lookup of the operations of a single transaction.
+    """
+    operations = get_transaction_results(tx_hash)["operations"]
+    if operations is None:
+        raise ValueError("No smart contract results found")
+    return {"operations": operations}
+
+def batch_correct_answers_item(tx_hash):
+    """
+    Batch lookup of the correct answer count of a single transaction.
+    """
+    record = get_transaction_results(tx_hash)
+    correct_answers = record["correct_answers"]
+    if correct_answers is None:
+        raise ValueError("No smart contract results found")
+    return {"correct_answers": f"{correct_answers}/5 correct answers", "wrong_questions": record.get("wrong_questions")}
+
+def stream_batch(lookup):
+    """
+    Run `lookup` for every tx hash of the request concurrently and stream NDJSON lines
+    in completion order. A failed lookup yields an error line instead of failing the batch.
+    """
+    tx_hashes = (request.json or {}).get("tx_hashes")
+    if not isinstance(tx_hashes, list) or not tx_hashes:
+        return jsonify({"error": "Missing 'tx_hashes' list"}), 400
+    if len(tx_hashes) > BATCH_MAX_SIZE:
+        return jsonify({"error": f"At most {BATCH_MAX_SIZE} tx hashes per batch"}), 400
+
+    futures = {batch_executor.submit(lookup, tx_hash): tx_hash for tx_hash in dict.fromkeys(tx_hashes)}
+
+    def generate():
+        for future in as_completed(futures):
+            item = {"tx_hash": futures[future]}
+            try:
+                item.update(future.result())
+            except Exception as e:
+                item["error"] = str(e)
+            yield json.dumps(item) + "\n"
+
+    return Response(generate(), mimetype="application/x-ndjson")
+
+@app.route("/batch/get_operations", methods=["POST"])
+def batch_get_operations():
+    """
+    Fetches the operations of many transactions concurrently, streamed back as NDJSON.
+    """
+    return stream_batch(batch_operations_item)
+
+@app.route("/batch/get_correct_answers", methods=["POST"])
+def batch_get_correct_answers():
+    """
+    Fetches the correct answer counts of many transactions concurrently, streamed back as NDJSON.
+    """
+    return stream_batch(batch_correct_answers_item)
+
+@app.route("/gateway_stats", methods=["GET"])
+def gateway_stats():
+    """
+    Reports gateway request, retry and connection reuse statistics, plus local nonce
+    bookkeeping, how many lookups were coalesced and the upstream rate limiters.
+    """
+    return jsonify({
+        **gateway.stats(),
+        "nonces": nonce_manager.stats(),
+        "singleflight": coalescer.stats(),
+        "schedulers": {scheduler.name: scheduler.stats() for scheduler in (gateway_scheduler, api_scheduler)},
+    }), 200
+
+@app.route("/cache_stats", methods=["GET"])
+def cache_stats():
+    """
+    Reports transaction result cache hit and miss counters.
+    """
+    return jsonify(tx_cache.stats()), 200
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    Exposes request, gateway, confirmation and cache metrics in the Prometheus text format.
+    """
+    return Response(registry.render(), content_type=CONTENT_TYPE)
+
+@app.route("/leaderboard", methods=["GET"])
+def leaderboard():
+    """
+    Returns the scores and test counts of all students of a contract, sorted and paginated.
+    Query parameters: `contract_address`, `sort` (score, num_tests, submissions, student),
+    `order` (desc or asc), `page` (from 1) and `page_size`. With `with_tests=1` every
+    student also carries their latest indexed test (`latest_test`, or null).
+    """
+    try:
+        contract_address = request_contract_address()
+        page = max(1, int(request.args.get("page", 1)))
+        page_size = min(LEADERBOARD_MAX_PAGE_SIZE, max(1, int(request.args.get("page_size", 50))))
+        descending = request.args.get("order", "desc") != "asc"
+
+        total, students = scoreboard.page(
+            contract_address,
+            sort=request.args.get("sort", "score"),
+            descending=descending,
+            offset=(page - 1) * page_size,
+            limit=page_size,
+        )
+        if request.args.get("with_tests") in ("1", "true"):
+            # One indexed lookup for the whole page instead of a /get_tests call per student
+            latest_tests = indexer.latest_tests(contract_address, [student["student"] for student in students])
+            for student in students:
+                student["latest_test"] = latest_tests.get(student["student"])
+        return jsonify({
+            "contract_address": contract_address,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "students": students,
+        }), 200
+    except (ConfigurationError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route("/get_test_results", methods=["POST"])
 def get_test_results():
     """
-    Calls the MultiversX blockchain to query test results for a specific user.
+    Queries the contract's `test_results` view for a specific user.
     """
     data = request.json
     contract_address = data.get("contract_address")
@@ -297,34 +960,11 @@ def get_test_results():
     if not contract_address or not user_address:
         return jsonify({"error": "Both contract_address and user_address are required."}), 400
 
-    # Command to call the mxpy CLI
-    command = [
-        "mxpy",
-        "contract",
-        "query",
-        contract_address,
-        "--function=test_results",
-        f"--proxy={PROXY_URL}",
-        f"--arguments={user_address}"
-    ]
-
-    # Execute the command
-    result = subprocess.run(command, capture_output=True, text=True)
-
-    # Check for errors
-    if result.returncode != 0:
-        return jsonify({"error": f"Command failed: {result.stderr}"}), 500
-
-    # Extract the first hexadecimal value from the output
-    raw_output = result.stdout.strip()
-    cleaned_hex_value = raw_output.replace("[", "").replace("]", "").replace("\"", "").strip()
-
-    # Convert the cleaned hexadecimal value to a decimal integer
     try:
-        decimal_value = int(cleaned_hex_value, 16)
-        return jsonify({"test_results": decimal_value}), 200
-    except ValueError as e:
-        return jsonify({"error": f"Failed to parse hex value: {cleaned_hex_value}, error: {str(e)}"}), 500
+        test_results = coalescer.do("test_results", (contract_address, user_address), lambda: contract_views.test_results(contract_address, user_address))
+        return jsonify({"test_results": test_results}), 200
+    except Exception as e:
+        return jsonify({"error": f"Query failed: {str(e)}"}), 500
 
 if __name__ == "__main__":
     print("Starting Flask API for AssigningStudents Smart Contract...")
@@ -0,0 +1,122 @@
+"""
+Micro-benchmarks for the contract result codec.
+
+Compares `codec` against the original hex-string implementations of
+`parse_operations` and the "Correct" marker count from `backend.py`.
+
+Usage: python backend/benchmarks/bench_codec.py [--results 5000] [--repeat 5]
+"""
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from codec import (  # noqa: E402
+    decode_feedback,
+    decode_feedback_bulk,
+    decode_operations,
+    decode_operations_bulk,
+    summarize_feedback,
+)
+
+
+def legacy_parse_operations(hex_data):
+    """
+    The original per-character implementation of `parse_operations`.
+    """
+    operations = []
+    for i in range(0, len(hex_data), 12):
+        segment = hex_data[i:i + 12]
+        if len(segment) < 12:
+            break
+
+        operand1 = int(segment[0:2], 16)
+        operator = chr(int(segment[4:6], 16))
+        operand2 = int(segment[8:10], 16)
+
+        operator_display = {
+            "+": "+",
+            "-": "-",
+            "*": "*",
+            "/": "/",
+        }.get(operator, "unknown")
+
+        operation_string = f"{operand1} {operator_display} {operand2}"
+
+        operations.append({
+            "hex_segment": segment,
+            "operand1": operand1,
+            "operator": operator_display,
+            "operand2": operand2,
+            "operation": operation_string
+        })
+
+    return operations
+
+
+def legacy_count_correct(hex_data):
+    """
+    The original marker count of `extract_correct_answers`.
+    """
+    return hex_data.count("436f72726563740000000000")
+
+
+def random_operations_hex(rng):
+    return b"".join(
+        bytes([rng.randrange(10), 32, rng.choice(b"+-*/"), 32, rng.randrange(1, 10), 0]) for _ in range(5)
+    ).hex()
+
+
+def random_feedback_hex(rng):
+    return b"".join(
+        rng.choice([b"Correct", b"Incorrect"]).ljust(12, b"\0") for _ in range(5)
+    ).hex()
+
+
+def run(name, statement, number, repeat):
+    best = min(timeit.repeat(statement, number=number, repeat=repeat))
+    print(f"{name:<40} {best * 1e6 / number:>10.2f} us/call")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, default=5000, help="results per bulk decode")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=2000, help="calls per single-result measurement")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    operations = [random_operations_hex(rng) for _ in range(args.results)]
+    feedbacks = [random_feedback_hex(rng) for _ in range(args.results)]
+    one_operations, one_feedback = operations[0], feedbacks[0]
+
+    # Sanity check: the codec must agree with the original implementation
+    assert decode_operations(bytes.fromhex(one_operations)) == legacy_parse_operations(one_operations)
+    assert all(
+        summarize_feedback(decode)["correct_answers"] == legacy_count_correct(raw)
+        for decode, raw in zip(decode_feedback_bulk(feedbacks), feedbacks)
+    )
+
+    print(f"single result ({args.number} calls, best of {args.repeat})")
+    run("legacy parse_operations", lambda: legacy_parse_operations(one_operations), args.number, args.repeat)
+    run("codec decode_operations", lambda: decode_operations(bytes.fromhex(one_operations)), args.number, args.repeat)
+    run("legacy correct marker count", lambda: legacy_count_correct(one_feedback), args.number, args.repeat)
+    run("codec decode_feedback + summarize", lambda: summarize_feedback(decode_feedback(bytes.fromhex(one_feedback))), args.number, args.repeat)
+
+    print(f"\nbulk ({args.results} results, best of {args.repeat})")
+    for name, statement in [
+        ("legacy parse_operations loop", lambda: [legacy_parse_operations(value) for value in operations]),
+        ("codec decode_operations_bulk", lambda: decode_operations_bulk(operations)),
+        ("legacy correct marker loop", lambda: [legacy_count_correct(value) for value in feedbacks]),
+        ("codec decode_feedback_bulk", lambda: decode_feedback_bulk(feedbacks)),
+    ]:
+        best = min(timeit.repeat(statement, number=1, repeat=args.repeat))
+        print(f"{name:<40} {best * 1e3:>10.2f} ms ({best * 1e6 / args.results:.2f} us/result)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark of gateway failover and hedged reads against local stand-in gateways.
+
+Every scenario runs the same read load (account nonce lookups) through a
+`GatewayClient` against one or more `MockGateway` nodes sharing one chain:
+
+* single     one node with a slow tail
+* hedged     two such nodes; reads slower than the first node's p95 are hedged
+* node_down  an unreachable node listed first, then a healthy one
+* flaky      a node failing a share of its requests, then a healthy one
+
+A final check sends transactions with an unreachable node listed first, to
+show that writes fail over on connection errors.
+
+Usage: python backend/benchmarks/bench_failover.py [--requests 2000] [--concurrency 20] [--tail-rate 0.02]
+"""
+import argparse
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gateway import GatewayClient, GatewayError  # noqa: E402
+from loadtest import CONTRACT_ADDRESS, new_address, percentile  # noqa: E402
+from mock_gateway import MockChain, MockGateway  # noqa: E402
+
+
+def unreachable_url():
+    # A port that was free a moment ago; nothing listens on it
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def run_reads(client, addresses, requests_count, concurrency):
+    def read(index):
+        started = time.perf_counter()
+        try:
+            client.get(f"address/{addresses[index % len(addresses)]}")
+            return time.perf_counter() - started, True
+        except GatewayError:
+            return time.perf_counter() - started, False
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(read, range(requests_count)))
+    return time.perf_counter() - started, results
+
+
+def report(name, client, elapsed, results):
+    latencies = [latency for latency, ok in results if ok]
+    errors = sum(1 for _, ok in results if not ok)
+    stats = client.stats()
+    if latencies:
+        p50, p95, p99 = (percentile(latencies, fraction) * 1e3 for fraction in (0.5, 0.95, 0.99))
+    else:
+        p50 = p95 = p99 = float("nan")
+    print(
+        f"{name:<10} {len(results) / elapsed:8.1f} req/s  p50 {p50:7.1f} ms  p95 {p95:7.1f} ms  p99 {p99:7.1f} ms  "
+        f"errors {errors:4d}  upstream {stats['requests']:5d}  hedged {stats['hedged']:4d}  "
+        f"hedge wins {stats['hedge_wins']:4d}  failovers {stats['failovers']:4d}"
+    )
+
+
+def check_write_failover(chain):
+    healthy = MockGateway(chain=chain).start()
+    client = GatewayClient([unreachable_url(), healthy], max_retries=0)
+    sender = new_address()
+    sent = 0
+    for nonce in range(5):
+        tx = {"sender": sender, "receiver": CONTRACT_ADDRESS, "nonce": nonce, "value": "0", "data": ""}
+        client.post("transaction/send", tx)
+        sent += 1
+    print(f"writes     {sent}/5 sent with the first node unreachable  failovers {client.stats()['failovers']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.01, help="mean latency of every node in seconds")
+    parser.add_argument("--tail-rate", type=float, default=0.02, help="fraction of requests delayed by --tail-latency (below the hedging percentile)")
+    parser.add_argument("--tail-latency", type=float, default=0.5)
+    parser.add_argument("--failure-rate", type=float, default=0.3, help="share of failed requests on the flaky node")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    chain = MockChain(seed=args.seed)
+    addresses = [new_address() for _ in range(50)]
+
+    def node(**kwargs):
+        return MockGateway(chain=chain, latency=args.latency, **kwargs).start()
+
+    scenarios = [
+        ("single", [node(tail_rate=args.tail_rate, tail_latency=args.tail_latency)]),
+        ("hedged", [node(tail_rate=args.tail_rate, tail_latency=args.tail_latency),
+                    node(tail_rate=args.tail_rate, tail_latency=args.tail_latency)]),
+        ("node_down", [unreachable_url(), node()]),
+        ("flaky", [node(failure_rate=args.failure_rate), node()]),
+    ]
+    for name, urls in scenarios:
+        client = GatewayClient(urls, pool_maxsize=args.concurrency * 2)
+        elapsed, results = run_reads(client, addresses, args.requests, args.concurrency)
+        report(name, client, elapsed, results)
+
+    check_write_failover(chain)
+
+
+if __name__ == "__main__":
+    main()
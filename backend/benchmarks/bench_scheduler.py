@@ -0,0 +1,95 @@
+"""
+Benchmark of the upstream scheduler against a rate-limited stand-in gateway.
+
+A pool of threads floods the gateway with bulk reads while one thread sends
+a transaction at a steady pace, once without a scheduler and once through an
+`UpstreamScheduler` set just below the gateway's quota. For each run the
+script reports read throughput, HTTP 429 answers, failed calls and the
+latency of the sends.
+
+Usage: python backend/benchmarks/bench_scheduler.py [--quota 100] [--readers 32] [--duration 10]
+"""
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gateway import GatewayClient, GatewayError  # noqa: E402
+from loadtest import CONTRACT_ADDRESS, new_address, percentile  # noqa: E402
+from mock_gateway import MockGateway  # noqa: E402
+from scheduler import BULK, UpstreamScheduler  # noqa: E402
+
+
+def run(name, scheduler, args):
+    server = MockGateway(latency=args.latency, rate_limit=args.quota)
+    client = GatewayClient(server.start(), pool_maxsize=args.readers + 4, scheduler=scheduler)
+    addresses = [new_address() for _ in range(50)]
+    stop = threading.Event()
+    reads = []
+    failures = []
+    sends = []
+
+    def reader(index):
+        count = 0
+        while not stop.is_set():
+            try:
+                if scheduler is not None:
+                    with scheduler.priority(BULK):
+                        client.get(f"address/{addresses[(index + count) % len(addresses)]}")
+                else:
+                    client.get(f"address/{addresses[(index + count) % len(addresses)]}")
+                count += 1
+            except GatewayError:
+                failures.append("read")
+        reads.append(count)
+
+    def sender():
+        address = new_address()
+        nonce = 0
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                client.post("transaction/send", {"sender": address, "receiver": CONTRACT_ADDRESS, "nonce": nonce, "value": "0", "data": ""})
+                sends.append(time.perf_counter() - started)
+                nonce += 1
+            except GatewayError:
+                failures.append("send")
+            time.sleep(args.send_interval)
+
+    with ThreadPoolExecutor(max_workers=args.readers + 1) as executor:
+        for index in range(args.readers):
+            executor.submit(reader, index)
+        executor.submit(sender)
+        time.sleep(args.duration)
+        stop.set()
+    server.shutdown()
+
+    send_p50, send_p99 = (percentile(sends, fraction) * 1e3 if sends else float("nan") for fraction in (0.5, 0.99))
+    print(
+        f"{name:<10} reads {sum(reads) / args.duration:7.1f}/s  sends {len(sends):4d}  "
+        f"send p50 {send_p50:7.1f} ms  p99 {send_p99:7.1f} ms  "
+        f"429s {server.rate_limited:5d}  failed reads {failures.count('read'):4d}  failed sends {failures.count('send'):3d}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quota", type=float, default=100.0, help="requests per second the gateway accepts")
+    parser.add_argument("--headroom", type=float, default=0.95, help="scheduler rate as a fraction of the quota")
+    parser.add_argument("--readers", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--send-interval", type=float, default=0.1)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    run("unlimited", None, args)
+    # A small burst keeps the scheduler from overrunning the gateway's own bucket
+    run("scheduled", UpstreamScheduler("bench", rate=args.quota * args.headroom, burst=max(1.0, args.quota * args.headroom / 10)), args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Benchmark of the Flask and asyncio serving modes under increasing concurrency.
+
+Both modes serve `/get_operations` for unique tx hashes (so every request
+goes upstream) against a local stand-in gateway with a fixed latency. For
+each concurrency level the script reports throughput, latency percentiles,
+errors and the peak number of OS threads in the process.
+
+Usage: python backend/benchmarks/bench_serving_modes.py [--concurrency 10 100 500] [--latency 0.2]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+from werkzeug.serving import make_server
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Keep the backend's SQLite files out of the working directory
+_data_dir = tempfile.mkdtemp(prefix="bench-serving-")
+os.environ.setdefault("TX_CACHE_PATH", os.path.join(_data_dir, "tx_cache.sqlite3"))
+os.environ.setdefault("INDEXER_DB_PATH", os.path.join(_data_dir, "indexer.sqlite3"))
+
+import async_backend  # noqa: E402
+import backend  # noqa: E402
+from async_gateway import AsyncGatewayClient  # noqa: E402
+from cache import TxResultCache  # noqa: E402
+from gateway import GatewayClient  # noqa: E402
+
+OPERATIONS_RESULT = "@6f6b@" + (bytes([3, 32, ord("+"), 32, 4, 0]) * 5).hex()
+
+
+def start_loop_thread():
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+
+def start_stub_gateway(loop, latency):
+    async def transaction(request):
+        await asyncio.sleep(latency)
+        return web.json_response({"data": {"transaction": {
+            "hash": request.match_info["tx_hash"],
+            "status": "success",
+            "smartContractResults": [{"data": OPERATIONS_RESULT}],
+        }}, "code": "successful"})
+
+    async def start():
+        app = web.Application()
+        app.router.add_get("/transaction/{tx_hash}", transaction)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        return runner.addresses[0][1]
+
+    return asyncio.run_coroutine_threadsafe(start(), loop).result()
+
+
+def start_flask_mode(gateway_url, pool_size):
+    backend.gateway = GatewayClient(gateway_url, pool_maxsize=pool_size)
+    backend.tx_cache = TxResultCache()
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, backend.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_port
+
+
+def start_async_mode(loop, gateway_url, connection_limit):
+    async_backend.gateway = AsyncGatewayClient(gateway_url, limit=connection_limit, limit_per_host=connection_limit)
+    async_backend.tx_cache = TxResultCache()
+
+    async def start():
+        runner = web.AppRunner(async_backend.create_app())
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        return runner.addresses[0][1]
+
+    return asyncio.run_coroutine_threadsafe(start(), loop).result()
+
+
+async def fire(port, prefix, concurrency):
+    latencies = []
+    errors = 0
+
+    async def one(session, index):
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            async with session.get(f"http://127.0.0.1:{port}/get_operations", params={"tx_hash": f"{prefix}-{index}"}) as response:
+                await response.read()
+                if response.status != 200:
+                    errors += 1
+        except aiohttp.ClientError:
+            errors += 1
+        latencies.append(time.perf_counter() - started)
+
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=120)) as session:
+        started = time.perf_counter()
+        await asyncio.gather(*(one(session, index) for index in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return elapsed, latencies, errors
+
+
+def measure(port, prefix, concurrency):
+    peak_threads = threading.active_count()
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak_threads
+        while not done.is_set():
+            peak_threads = max(peak_threads, threading.active_count())
+            time.sleep(0.01)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    elapsed, latencies, errors = asyncio.run(fire(port, prefix, concurrency))
+    done.set()
+    sampler.join()
+    return elapsed, latencies, errors, peak_threads
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--latency", type=float, default=0.2, help="stand-in gateway latency in seconds")
+    parser.add_argument("--connection-limit", type=int, default=100, help="upstream connection limit of both modes")
+    args = parser.parse_args()
+
+    loop = start_loop_thread()
+    gateway_url = f"http://127.0.0.1:{start_stub_gateway(loop, args.latency)}"
+    modes = {
+        "flask": start_flask_mode(gateway_url, args.connection_limit),
+        "asyncio": start_async_mode(loop, gateway_url, args.connection_limit),
+    }
+
+    print(f"{'mode':<8} {'conc':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6} {'threads':>7}")
+    for concurrency in args.concurrency:
+        for mode, port in modes.items():
+            elapsed, latencies, errors, threads = measure(port, f"{mode}-{concurrency}-{time.time_ns()}", concurrency)
+            print(
+                f"{mode:<8} {concurrency:>5} {concurrency / elapsed:>8.1f} "
+                f"{statistics.median(latencies) * 1e3:>8.1f} {percentile(latencies, 0.95) * 1e3:>8.1f} "
+                f"{percentile(latencies, 0.99) * 1e3:>8.1f} {errors:>6} {threads:>7}"
+            )
+
+    asyncio.run_coroutine_threadsafe(async_backend.gateway.close(), loop).result()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+End-to-end load test: N simulated students run the generate -> submit -> score cycle.
+
+By default everything runs in-process: a local mock gateway (mock_gateway.py)
+and the backend in Flask or asyncio mode pointed at it, so no devnet traffic
+is generated. Either side can be replaced with a running instance through
+--backend-url / --gateway-url.
+
+Reports overall throughput and, per endpoint, request count, errors,
+throughput and p50/p95/p99 latency.
+
+Usage: python backend/benchmarks/loadtest.py --students 200 --block-time 0.6 --latency 0.02
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from multiversx_sdk import UserPEM, UserSecretKey  # noqa: E402
+
+from codec import expected_answer  # noqa: E402
+from mock_gateway import MockGateway  # noqa: E402
+
+CONTRACT_ADDRESS = "erd1qqqqqqqqqqqqqpgqp699jngundfqw07d8jzkepucvpzush6k3wvqyc44rx"
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def call(self, session, endpoint, method, url, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=300, **kwargs)
+            ok = response.status_code == 200
+            body = response.json() if ok else None
+        except (requests.RequestException, ValueError):
+            ok, body = False, None
+        with self.lock:
+            self.latencies[endpoint].append(time.perf_counter() - started)
+            if not ok:
+                self.errors[endpoint] += 1
+        return body
+
+
+def new_address():
+    return UserSecretKey.generate().generate_public_key().to_address("erd").to_bech32()
+
+
+def new_wallet_pem():
+    secret_key = UserSecretKey.generate()
+    label = secret_key.generate_public_key().to_address("erd").to_bech32()
+    return UserPEM(label=label, secret_key=secret_key).to_text()
+
+
+def student_cycle(session, recorder, backend_url, wrong_rate, rng):
+    sender = new_address()
+
+    generated = recorder.call(session, "generate_and_get_operations", "POST", f"{backend_url}/generate_and_get_operations", json={"sender_address": sender})
+    if not generated:
+        return False
+
+    answers = []
+    for operation in generated["operations"]:
+        answer = expected_answer(operation["operand1"], operation["operator"], operation["operand2"])
+        if rng.random() < wrong_rate:
+            answer = answer - 1 if answer > 0 else answer + 1
+        answers.append(answer)
+
+    submitted = recorder.call(session, "submit_test", "POST", f"{backend_url}/submit_test", json={"sender_address": sender, "answers": answers})
+    if not submitted:
+        return False
+
+    recorder.call(session, "get_correct_answers", "GET", f"{backend_url}/get_correct_answers", params={"tx_hash": submitted["tx_hash"]})
+    recorder.call(session, "get_test_results", "POST", f"{backend_url}/get_test_results", json={"contract_address": CONTRACT_ADDRESS, "user_address": sender})
+    return True
+
+
+def start_backend(mode, gateway_url, poll_interval):
+    # The backend reads the gateway (and API) URL at import time
+    os.environ["PROXY_URL"] = gateway_url
+    os.environ["API_URL"] = gateway_url
+    # Keep the backend's SQLite files out of the working directory
+    data_dir = tempfile.mkdtemp(prefix="loadtest-")
+    os.environ.setdefault("TX_CACHE_PATH", os.path.join(data_dir, "tx_cache.sqlite3"))
+    os.environ.setdefault("INDEXER_DB_PATH", os.path.join(data_dir, "indexer.sqlite3"))
+    import backend
+    backend.CONFIRMATION_INITIAL_DELAY = poll_interval
+    backend.CONFIRMATION_MAX_DELAY = max(poll_interval, backend.CONFIRMATION_MAX_DELAY / 4)
+
+    if mode == "flask":
+        from werkzeug.serving import make_server
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+        server = make_server("127.0.0.1", 0, backend.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{server.server_port}"
+
+    import async_backend
+    from aiohttp import web
+    async_backend.CONFIRMATION_INITIAL_DELAY = backend.CONFIRMATION_INITIAL_DELAY
+    async_backend.CONFIRMATION_MAX_DELAY = backend.CONFIRMATION_MAX_DELAY
+
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+    async def start():
+        runner = web.AppRunner(async_backend.create_app())
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        return runner.addresses[0][1]
+
+    return f"http://127.0.0.1:{asyncio.run_coroutine_threadsafe(start(), loop).result()}"
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def report(recorder, elapsed, students, completed):
+    print(f"\n{completed}/{students} student cycles completed in {elapsed:.2f}s ({completed / elapsed:.1f} cycles/s)\n")
+    print(f"{'endpoint':<30} {'count':>6} {'errors':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for endpoint, latencies in recorder.latencies.items():
+        print(
+            f"{endpoint:<30} {len(latencies):>6} {recorder.errors[endpoint]:>6} {len(latencies) / elapsed:>8.1f} "
+            f"{percentile(latencies, 0.50) * 1e3:>9.1f} {percentile(latencies, 0.95) * 1e3:>9.1f} {percentile(latencies, 0.99) * 1e3:>9.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=None, help="students running at once (default: all)")
+    parser.add_argument("--mode", choices=["flask", "async"], default="flask", help="in-process backend mode")
+    parser.add_argument("--backend-url", default=None, help="use a running backend instead of an in-process one")
+    parser.add_argument("--gateway-url", default=None, help="use a running gateway instead of an in-process mock")
+    parser.add_argument("--block-time", type=float, default=0.6)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--poll-interval", type=float, default=0.25, help="initial confirmation poll delay of the in-process backend")
+    parser.add_argument("--wrong-rate", type=float, default=0.2, help="fraction of answers given wrong")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    gateway_url = args.gateway_url
+    if gateway_url is None:
+        gateway_url = MockGateway(block_time=args.block_time, latency=args.latency, failure_rate=args.failure_rate, seed=args.seed).start()
+
+    backend_url = args.backend_url or start_backend(args.mode, gateway_url, args.poll_interval)
+    concurrency = args.concurrency or args.students
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    response = session.post(f"{backend_url}/set_config", json={"contract_address": CONTRACT_ADDRESS, "wallet_pem": new_wallet_pem()})
+    response.raise_for_status()
+
+    recorder = Recorder()
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(
+            lambda _: student_cycle(session, recorder, backend_url, args.wrong_rate, rng),
+            range(args.students),
+        ))
+    report(recorder, time.perf_counter() - started, args.students, sum(outcomes))
+
+
+if __name__ == "__main__":
+    main()
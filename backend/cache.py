@@ -0,0 +1,118 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class TxResultCache:
+    """
+    Bounded in-memory cache of decoded transaction results, keyed by tx hash.
+
+    Results of finalized transactions never change, so they never expire; they
+    are only evicted (least recently used first) when the memory cap is reached.
+    Pending results are kept for a short TTL. Finalized entries can also be
+    written to an on-disk SQLite tier so they survive a restart. The disk tier
+    has its own lock, so memory hits never wait behind disk reads or commits.
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024, pending_ttl=3.0, disk_path=None):
+        self.max_bytes = max_bytes
+        self.pending_ttl = pending_ttl
+
+        self._entries = OrderedDict()  # tx_hash -> (record, size, expires_at or None)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+        self._disk = None
+        self._disk_lock = threading.Lock()
+        if disk_path is not None:
+            self._disk = sqlite3.connect(str(disk_path), check_same_thread=False)
+            self._disk.execute("CREATE TABLE IF NOT EXISTS tx_results (tx_hash TEXT PRIMARY KEY, record TEXT NOT NULL)")
+            self._disk.commit()
+
+    def get(self, tx_hash):
+        """
+        Return the cached record for `tx_hash`, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(tx_hash)
+            if entry is not None:
+                record, _, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(tx_hash)
+                    self.hits += 1
+                    return record
+                self._remove(tx_hash)
+
+        row = None
+        if self._disk is not None:
+            with self._disk_lock:
+                row = self._disk.execute("SELECT record FROM tx_results WHERE tx_hash = ?", (tx_hash,)).fetchone()
+
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        record = json.loads(row[0])
+        with self._lock:
+            self._insert(tx_hash, record, row[0], None)
+            self.hits += 1
+            self.disk_hits += 1
+            return record
+
+    def put(self, tx_hash, record, final, persist=True):
+        """
+        Cache a decoded record. Finalized records never expire; pending ones get a short TTL.
+
+        :param persist: Whether a finalized record is also written to the disk tier
+            (False for records already stored elsewhere, e.g. in the local index).
+        """
+        serialized = json.dumps(record)
+        expires_at = None if final else time.monotonic() + self.pending_ttl
+
+        with self._lock:
+            self._insert(tx_hash, record, serialized, expires_at)
+        if final and persist and self._disk is not None:
+            with self._disk_lock, self._disk:
+                self._disk.execute("INSERT OR REPLACE INTO tx_results (tx_hash, record) VALUES (?, ?)", (tx_hash, serialized))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _insert(self, tx_hash, record, serialized, expires_at):
+        if tx_hash in self._entries:
+            self._remove(tx_hash)
+
+        size = len(serialized)
+        if size > self.max_bytes:
+            return
+
+        self._entries[tx_hash] = (record, size, expires_at)
+        self._bytes += size
+
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, tx_hash):
+        _, size, _ = self._entries.pop(tx_hash)
+        self._bytes -= size
@@ -0,0 +1,197 @@
+"""
+Binary codec for the values returned by the AssigningStudents contract.
+
+The layouts mirror `src/project.rs`:
+
+* `generate_test` returns `[[u8; 6]; 5]`: five operations of the form
+  `[operand1, b' ', operator, b' ', operand2, 0]`.
+* `submit_test` returns `[[u8; 12]; 5]`: five zero-padded feedback strings,
+  either `Correct` or `Incorrect`.
+
+Decoding works directly on `bytes`/`memoryview` buffers in a single pass.
+"""
+from confirmation import FAILED_STATUSES, is_final
+
+QUESTIONS_PER_TEST = 5
+OPERATION_SIZE = 6
+FEEDBACK_SIZE = 12
+OPERATIONS_SIZE = QUESTIONS_PER_TEST * OPERATION_SIZE
+FEEDBACKS_SIZE = QUESTIONS_PER_TEST * FEEDBACK_SIZE
+
+OPERATORS = {ord("+"): "+", ord("-"): "-", ord("*"): "*", ord("/"): "/"}
+CORRECT_FEEDBACK = b"Correct".ljust(FEEDBACK_SIZE, b"\0")
+
+
+def decode_operations(buffer):
+    """
+    Decode a `[[u8; 6]; N]` buffer into operations.
+
+    :param buffer: bytes, bytearray or memoryview holding the raw operations.
+    :return: List of operation dicts (hex segment, operands, operator, display string).
+    """
+    view = memoryview(buffer)
+    operations = []
+    for start in range(0, len(view) - OPERATION_SIZE + 1, OPERATION_SIZE):
+        operand1 = view[start]
+        operator = OPERATORS.get(view[start + 2], "unknown")
+        operand2 = view[start + 4]
+        operations.append({
+            "hex_segment": view[start:start + OPERATION_SIZE].hex(),
+            "operand1": operand1,
+            "operator": operator,
+            "operand2": operand2,
+            "operation": f"{operand1} {operator} {operand2}",
+        })
+    return operations
+
+
+def decode_feedback(buffer):
+    """
+    Decode a `[[u8; 12]; N]` buffer into per-question feedback.
+
+    :param buffer: bytes, bytearray or memoryview holding the raw feedback.
+    :return: List of dicts with the question number, correctness and feedback text.
+    """
+    view = memoryview(buffer)
+    feedback = []
+    for question, start in enumerate(range(0, len(view) - FEEDBACK_SIZE + 1, FEEDBACK_SIZE), start=1):
+        chunk = view[start:start + FEEDBACK_SIZE]
+        correct = chunk == CORRECT_FEEDBACK
+        feedback.append({
+            "question": question,
+            "correct": correct,
+            "feedback": "Correct" if correct else bytes(chunk).rstrip(b"\0").decode("ascii", errors="replace"),
+        })
+    return feedback
+
+
+def summarize_feedback(feedback):
+    """
+    Summarize decoded feedback into the correct answer count and the wrong questions.
+    """
+    wrong = [item["question"] for item in feedback if not item["correct"]]
+    return {"correct_answers": len(feedback) - len(wrong), "wrong_questions": wrong}
+
+
+def solve_operation(operand1, operator, operand2):
+    """
+    Mirror of `solve_operation` in `src/project.rs`: i8 arithmetic where
+    division truncates toward zero and dividing by zero (or an unknown
+    operator) yields 0.
+    """
+    if operator == "+":
+        result = operand1 + operand2
+    elif operator == "-":
+        result = operand1 - operand2
+    elif operator == "*":
+        result = operand1 * operand2
+    elif operator == "/" and operand2 != 0:
+        result = abs(operand1) // abs(operand2) * (1 if (operand1 < 0) == (operand2 < 0) else -1)
+    else:
+        return 0
+    # Wrap to i8 like the contract's arithmetic
+    return (result + 128) % 256 - 128
+
+
+def decode_answer(byte):
+    """
+    Interpret an answer byte the way `submit_test` does (values above 127 are negative).
+    """
+    return byte - 256 if byte > 127 else byte
+
+
+def expected_answer(operand1, operator, operand2):
+    """
+    The answer `submit_test` accepts for an operation.
+
+    `submit_test` copies the stored operation up to its first zero byte before
+    solving it, so an operation whose first operand is 0 is solved as an empty
+    one and only accepts 0.
+    """
+    if operand1 == 0:
+        return 0
+    return solve_operation(operand1, operator, operand2)
+
+
+def grade_answers(operations, answers):
+    """
+    Grade answers locally exactly like `submit_test`, without the chain.
+
+    :param operations: Decoded operations of the test (see `decode_operations`).
+    :param answers: Integer answers as sent to `/submit_test` (encoded like `answers_to_hex`).
+    :return: Per-question feedback in the layout of `decode_feedback`.
+    """
+    feedback = []
+    for question, operation in enumerate(operations[:QUESTIONS_PER_TEST], start=1):
+        answer = decode_answer(answers[question - 1] % 256) if question <= len(answers) else 0
+        correct = answer == expected_answer(operation["operand1"], operation["operator"], operation["operand2"])
+        feedback.append({"question": question, "correct": correct, "feedback": "Correct" if correct else "Incorrect"})
+    return feedback
+
+
+def from_hex(hex_data):
+    """
+    Convert a hex payload into bytes, dropping a trailing partial byte.
+    """
+    return bytes.fromhex(hex_data[:len(hex_data) & ~1])
+
+
+def _decode_bulk(hex_values, size, decoder):
+    # Fixed-size values are converted with a single bytes.fromhex call and sliced
+    # through one memoryview; anything malformed is decoded on its own.
+    if all(len(value) == 2 * size for value in hex_values):
+        view = memoryview(bytes.fromhex("".join(hex_values)))
+        return [decoder(view[start:start + size]) for start in range(0, len(view), size)]
+    return [decoder(from_hex(value)) for value in hex_values]
+
+
+def decode_operations_bulk(hex_values):
+    """
+    Decode many hex-encoded `generate_test` results at once.
+    """
+    return _decode_bulk(hex_values, OPERATIONS_SIZE, decode_operations)
+
+
+def decode_feedback_bulk(hex_values):
+    """
+    Decode many hex-encoded `submit_test` results at once.
+    """
+    return _decode_bulk(hex_values, FEEDBACKS_SIZE, decode_feedback)
+
+
+def result_payloads(sc_results):
+    """
+    Yield the decoded return value of every smart contract result (`@6f6b@<value>`).
+    """
+    for result in sc_results:
+        data = result.get("data")
+        if data and "@" in data:
+            yield from_hex(data.rsplit("@", 1)[-1])
+
+
+def decode_transaction(transaction):
+    """
+    Decode the operations and feedback carried by a transaction's smart contract results.
+
+    :param transaction: Transaction dict with `status` and `smartContractResults` (gateway layout).
+    :return: Dict with the transaction status, finality, operations and per-question feedback.
+    """
+    status = transaction.get("status")
+    record = {
+        "status": status,
+        "final": is_final(transaction) or status in FAILED_STATUSES,
+        "operations": None,
+        "feedback": None,
+        "correct_answers": None,
+        "wrong_questions": None,
+    }
+
+    # generate_test returns [[u8; 6]; 5], submit_test returns [[u8; 12]; 5]
+    for payload in result_payloads(transaction.get("smartContractResults", [])):
+        if len(payload) == OPERATIONS_SIZE and record["operations"] is None:
+            record["operations"] = decode_operations(payload)
+        elif len(payload) == FEEDBACKS_SIZE and record["feedback"] is None:
+            record["feedback"] = decode_feedback(payload)
+            record.update(summarize_feedback(record["feedback"]))
+
+    return record
@@ -0,0 +1,152 @@
+import hashlib
+import threading
+
+from multiversx_sdk import (
+    Address,
+    UserPEM,
+    UserSigner,
+    TransactionComputer,
+    TransactionsFactoryConfig,
+    SmartContractTransactionsFactory,
+)
+
+from metrics import registry
+
+SIGN_LATENCY = registry.histogram("transaction_sign_duration_seconds", "Time spent computing and signing transactions.")
+
+
+class ConfigurationError(LookupError):
+    """
+    Raised when a request targets a contract (or wallet) that has not been configured.
+    """
+
+
+class ContractConfig:
+    """
+    Prebuilt SDK objects for one (contract, wallet) pair.
+
+    Everything is created once at registration and shared by all requests for
+    that pair; none of it is mutated afterwards, so it is safe to use concurrently.
+    """
+
+    def __init__(self, contract_address, wallet_pem, chain_id, gateway):
+        pem = UserPEM.from_text(wallet_pem)
+
+        self.contract_address = contract_address
+        self.contract = Address.from_bech32(contract_address)
+        self.wallet_address = pem.public_key.to_address("erd").to_bech32()
+        self.signer = UserSigner(pem.secret_key)
+        self.transaction_computer = TransactionComputer()
+        self.transactions_factory = SmartContractTransactionsFactory(
+            TransactionsFactoryConfig(chain_id=chain_id)
+        )
+        self.gateway = gateway
+
+    @property
+    def key(self):
+        return (self.contract_address, self.wallet_address)
+
+    def create_call(self, sender_address, function, arguments=(), gas_limit=5_000_000):
+        """
+        Build an unsigned call of a contract endpoint.
+        """
+        return self.transactions_factory.create_transaction_for_execute(
+            sender=sender_address,
+            contract=self.contract,
+            function=function,
+            arguments=list(arguments),
+            gas_limit=gas_limit,
+        )
+
+    def sign(self, tx, nonce):
+        """
+        Assign a nonce to a transaction and sign it with this configuration's wallet.
+        """
+        with SIGN_LATENCY.time():
+            tx.nonce = nonce
+            bytes_to_sign = self.transaction_computer.compute_bytes_for_signing(tx)
+            tx.signature = self.signer.sign(bytes_to_sign)
+        return tx
+
+
+class ConfigRegistry:
+    """
+    Thread-safe in-memory registry of contract configurations keyed by (contract, wallet).
+
+    Registering the same contract and PEM again reuses the existing entry
+    instead of re-parsing the key. Requests select an entry by contract and
+    wallet. Either may be left out only while it is unambiguous: with a single
+    registered entry (the single-teacher setup), or a single wallet for the
+    named contract. Otherwise the request is rejected rather than signed with
+    whichever wallet registered last.
+    """
+
+    def __init__(self, chain_id, gateway):
+        self.chain_id = chain_id
+        self.gateway = gateway
+        self._configs = {}  # (contract, wallet) -> ContractConfig
+        self._by_pem = {}  # (contract, sha256(pem)) -> ContractConfig
+        self._lock = threading.Lock()
+
+    def register(self, contract_address, wallet_pem):
+        pem_key = (contract_address, hashlib.sha256(wallet_pem.encode()).hexdigest())
+        with self._lock:
+            config = self._by_pem.get(pem_key)
+
+        if config is None:
+            # Parse outside the lock; a concurrent registration of the same pair is harmless
+            config = ContractConfig(contract_address, wallet_pem, self.chain_id, self.gateway)
+
+        with self._lock:
+            config = self._configs.setdefault(config.key, config)
+            self._by_pem[pem_key] = config
+        return config
+
+    def get(self, contract_address=None, wallet_address=None):
+        """
+        Select the configuration for a request.
+
+        :raises ConfigurationError: If no matching configuration has been registered,
+            or if the request leaves out a contract or wallet that several configurations could match.
+        """
+        with self._lock:
+            if wallet_address is not None:
+                config = self._configs.get((self._resolve_contract(contract_address), wallet_address))
+                if config is None:
+                    raise ConfigurationError("Configuration not set for this contract and wallet.")
+                return config
+
+            matching = [config for key, config in self._configs.items() if contract_address in (None, key[0])]
+
+        if not matching:
+            raise ConfigurationError("Configuration not set for this contract." if contract_address else "Configuration not set.")
+        if len(matching) > 1:
+            if contract_address is None:
+                raise ConfigurationError("Several configurations are registered; name one with contract_address and wallet_address.")
+            raise ConfigurationError("Several wallets are registered for this contract; name one with wallet_address.")
+        return matching[0]
+
+    def contract_address(self, contract_address=None):
+        """
+        Resolve the contract of a request, which may be left out while a single contract is configured.
+
+        :raises ConfigurationError: If the contract is unknown or cannot be told from several.
+        """
+        with self._lock:
+            return self._resolve_contract(contract_address)
+
+    def _resolve_contract(self, contract_address):
+        contracts = {contract for contract, _ in self._configs}
+        if contract_address is not None:
+            if contract_address not in contracts:
+                raise ConfigurationError("Configuration not set for this contract.")
+            return contract_address
+        if not contracts:
+            raise ConfigurationError("Configuration not set.")
+        if len(contracts) > 1:
+            raise ConfigurationError("Several contracts are configured; name one with contract_address.")
+        return next(iter(contracts))
+
+    def list(self):
+        with self._lock:
+            return [{"contract_address": contract, "wallet_address": wallet} for contract, wallet in self._configs]
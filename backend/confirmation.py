@@ -0,0 +1,186 @@
+import asyncio
+import base64
+import time
+
+# Gateway statuses that mean the transaction will never produce results
+FAILED_STATUSES = {"fail", "invalid"}
+# Gateway statuses that mean the transaction itself has been executed
+SUCCESS_STATUSES = {"success", "executed"}
+
+
+class TransactionTimeout(TimeoutError):
+    """
+    Raised when a transaction is not final before the confirmation deadline.
+    """
+
+    def __init__(self, tx_hash, status, waited):
+        super().__init__(f"Transaction {tx_hash} not final after {waited:.1f}s (last status: {status}).")
+        self.tx_hash = tx_hash
+        self.status = status
+        self.waited = waited
+
+
+class TransactionFailed(Exception):
+    """
+    Raised when a transaction was processed but failed or was rejected.
+    """
+
+    def __init__(self, tx_hash, status, reason):
+        super().__init__(f"Transaction {tx_hash} {status}: {reason}")
+        self.tx_hash = tx_hash
+        self.status = status
+        self.reason = reason
+
+
+def failure_reason(transaction):
+    """
+    Extract the error message of a failed transaction from its `signalError` log event.
+    """
+    for event in (transaction.get("logs") or {}).get("events") or []:
+        if event.get("identifier") != "signalError":
+            continue
+        topics = event.get("topics") or []
+        if len(topics) > 1:
+            try:
+                return base64.b64decode(topics[1]).decode("utf-8", errors="replace")
+            except (ValueError, TypeError):
+                pass
+        return "signalError"
+    return None
+
+
+def is_final(transaction):
+    """
+    A transaction is final once it executed and its smart contract results are available.
+    """
+    status = transaction.get("status")
+    return status in SUCCESS_STATUSES and bool(transaction.get("smartContractResults"))
+
+
+def check_transaction(fetch, tx_hash):
+    """
+    Fetch a transaction once and report whether it is final.
+
+    :return: Tuple of (gateway payload if final else None, last known status).
+    :raises TransactionFailed: If the transaction failed or was rejected.
+    """
+    try:
+        data = fetch(tx_hash)
+    except ValueError:
+        # Freshly broadcast transactions are not always visible yet
+        return None, "unknown"
+
+    return evaluate_transaction(tx_hash, data)
+
+
+def evaluate_transaction(tx_hash, data):
+    """
+    Classify an already fetched transaction payload.
+
+    :return: Tuple of (payload if final else None, status).
+    :raises TransactionFailed: If the transaction failed or was rejected.
+    """
+    transaction = data["data"]["transaction"]
+    status = transaction.get("status", "unknown")
+
+    reason = failure_reason(transaction)
+    if status in FAILED_STATUSES or reason:
+        raise TransactionFailed(tx_hash, status, reason or "rejected by the network")
+    return (data if is_final(transaction) else None), status
+
+
+def wait_for_transaction(fetch, tx_hash, timeout=90.0, initial_delay=1.0, max_delay=6.0, backoff=1.5):
+    """
+    Poll a transaction until it is final and return the last gateway payload.
+
+    The polling interval starts at `initial_delay` and grows by `backoff` up to
+    `max_delay`, so fast transactions are picked up quickly without hammering the
+    gateway while slow ones are pending.
+
+    :param fetch: Callable returning the gateway payload for `tx_hash` (withResults=true).
+    :param tx_hash: The transaction hash.
+    :param timeout: Overall deadline in seconds.
+    :return: The gateway payload of the final transaction.
+    :raises TransactionFailed: If the transaction failed or was rejected.
+    :raises TransactionTimeout: If the transaction is not final before the deadline.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    delay = initial_delay
+
+    while True:
+        time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+
+        data, status = check_transaction(fetch, tx_hash)
+        if data is not None:
+            return data
+
+        if time.monotonic() >= deadline:
+            raise TransactionTimeout(tx_hash, status, time.monotonic() - started)
+        delay = min(delay * backoff, max_delay)
+
+
+def wait_for_transactions(fetch, tx_hashes, timeout=90.0, initial_delay=1.0, max_delay=6.0, backoff=1.5, map_fn=map):
+    """
+    Poll many transactions together until each one is final, failed or timed out.
+
+    Every round only polls the transactions that are still pending, using
+    `map_fn` (e.g. an executor's `map`) so a round costs about one gateway
+    round trip rather than one per transaction.
+
+    :return: Dict mapping each tx hash to its final payload, or to the
+             TransactionFailed / TransactionTimeout error it ended with.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    delay = initial_delay
+    pending = {tx_hash: "unknown" for tx_hash in tx_hashes}
+    results = {}
+
+    def poll(tx_hash):
+        try:
+            return tx_hash, check_transaction(fetch, tx_hash)
+        except TransactionFailed as e:
+            return tx_hash, (e, e.status)
+
+    while pending:
+        time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+
+        for tx_hash, (outcome, status) in map_fn(poll, list(pending)):
+            pending[tx_hash] = status
+            if outcome is not None:
+                results[tx_hash] = outcome
+                del pending[tx_hash]
+
+        if pending and time.monotonic() >= deadline:
+            waited = time.monotonic() - started
+            for tx_hash, status in pending.items():
+                results[tx_hash] = TransactionTimeout(tx_hash, status, waited)
+            break
+        delay = min(delay * backoff, max_delay)
+
+    return results
+
+
+async def wait_for_transaction_async(fetch, tx_hash, timeout=90.0, initial_delay=1.0, max_delay=6.0, backoff=1.5):
+    """
+    Coroutine version of `wait_for_transaction`; `fetch` is a coroutine function.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    delay = initial_delay
+
+    while True:
+        await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+
+        try:
+            data, status = evaluate_transaction(tx_hash, await fetch(tx_hash))
+        except ValueError:
+            # Freshly broadcast transactions are not always visible yet
+            data, status = None, "unknown"
+        if data is not None:
+            return data
+
+        if time.monotonic() >= deadline:
+            raise TransactionTimeout(tx_hash, status, time.monotonic() - started)
+        delay = min(delay * backoff, max_delay)
@@ -0,0 +1,85 @@
+import base64
+import threading
+import time
+
+from multiversx_sdk import Address
+
+from metrics import registry
+
+VIEW_CACHE_LOOKUPS = registry.counter("view_cache_lookups_total", "Contract view cache lookups by result.", ("result",))
+
+
+def decode_u64(return_data):
+    """
+    Decode a top-encoded unsigned integer from a base64 return value (empty means 0).
+    """
+    raw = base64.b64decode(return_data) if return_data else b""
+    return int.from_bytes(raw, byteorder="big")
+
+
+def test_results_arguments(user):
+    """
+    Hex-encoded arguments of the `test_results` view for a bech32 user address.
+    """
+    return [Address.from_bech32(user).to_hex()]
+
+
+class ContractViews:
+    """
+    In-process contract view queries over the shared gateway client.
+
+    `test_results` values are cached for a short time per (contract, user) and
+    invalidated as soon as that user submits a test.
+    """
+
+    def __init__(self, gateway, ttl=10.0):
+        self.gateway = gateway
+        self.ttl = ttl
+        self._cache = {}  # (contract, user) -> (value, expires_at)
+        self._lock = threading.Lock()
+
+    def test_results(self, contract, user):
+        """
+        Query the `test_results` view of a contract for a user.
+
+        :param contract: Bech32 address of the contract.
+        :param user: Bech32 address of the user.
+        :return: The user's score as an integer.
+        """
+        value = self.lookup(contract, user)
+        if value is not None:
+            return value
+        return self.refresh(contract, user)
+
+    def refresh(self, contract, user):
+        """
+        Query `test_results` from the contract regardless of the cache, and cache the value.
+        """
+        return_data = self.gateway.query_contract(contract, "test_results", test_results_arguments(user))
+        value = decode_u64(return_data[0] if return_data else "")
+
+        self.store(contract, user, value)
+        return value
+
+    def lookup(self, contract, user):
+        """
+        Return the cached `test_results` value of a user, or None if absent or expired.
+        """
+        with self._lock:
+            cached = self._cache.get((contract, user))
+            if cached is not None and cached[1] > time.monotonic():
+                VIEW_CACHE_LOOKUPS.inc(result="hit")
+                return cached[0]
+        VIEW_CACHE_LOOKUPS.inc(result="miss")
+        return None
+
+    def store(self, contract, user, value):
+        with self._lock:
+            self._cache[(contract, user)] = (value, time.monotonic() + self.ttl)
+
+    def invalidate(self, contract, user):
+        """
+        Drop the cached view values of a user, e.g. after they submitted a test.
+        """
+        with self._lock:
+            self._cache.pop((contract, user), None)
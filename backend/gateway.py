@@ -0,0 +1,476 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import registry
+from scheduler import READ, SEND
+
+# Responses worth retrying: throttling and transient upstream failures
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Weight of the newest latency in a node's moving average
+EWMA_ALPHA = 0.2
+# Successful calls a node needs before its latency percentile is trusted for hedging
+HEDGE_MIN_SAMPLES = 20
+
+# Upstream instrumentation (shared with AsyncGatewayClient); one sample per attempt
+GATEWAY_REQUESTS = registry.counter("gateway_requests_total", "Gateway call attempts by route and outcome.", ("route", "method", "outcome"))
+GATEWAY_LATENCY = registry.histogram("gateway_request_duration_seconds", "Duration of gateway call attempts.", ("route", "method"))
+GATEWAY_RETRIES = registry.counter("gateway_retries_total", "Gateway call attempts that were retried.", ("route", "method"))
+GATEWAY_HEDGES = registry.counter("gateway_hedged_requests_total", "Reads sent to a second gateway node because the first was slow.", ("route",))
+
+
+class GatewayError(ValueError):
+    """
+    Raised when the gateway answers with an error or cannot be reached.
+    """
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ContractQueryError(GatewayError):
+    """
+    Raised when a VM query runs but the contract returns an error (e.g. a failed `require!`).
+    """
+
+    def __init__(self, function, return_code, return_message):
+        super().__init__(f"Query {function} failed: {return_code} {return_message or ''}".strip())
+        self.return_code = return_code
+        self.return_message = return_message
+
+
+class GatewayEndpoint:
+    """
+    One gateway node with its health and recent latencies.
+
+    A node is taken out of rotation for `cooldown` seconds after
+    `failure_threshold` consecutive failures (connection errors, timeouts and
+    retryable status codes). Latencies of successful calls feed an EWMA used
+    for ordering and a window used for the hedging percentile.
+    """
+
+    def __init__(self, base_url, failure_threshold=3, cooldown=10.0, window=200):
+        self.base_url = base_url.rstrip("/")
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.ewma = None
+        self.consecutive_failures = 0
+        self.down_until = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def healthy(self):
+        return self.down_until <= time.monotonic()
+
+    def record_success(self, latency):
+        with self._lock:
+            self.requests += 1
+            self._latencies.append(latency)
+            self.ewma = latency if self.ewma is None else EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.ewma
+            self.consecutive_failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.requests += 1
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= self.failure_threshold:
+                self.down_until = time.monotonic() + self.cooldown
+
+    def latency_percentile(self, fraction):
+        """
+        Latency percentile of recent successful calls, or None without enough samples.
+        """
+        with self._lock:
+            if len(self._latencies) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def stats(self):
+        p95 = self.latency_percentile(0.95)
+        with self._lock:
+            return {
+                "url": self.base_url,
+                "healthy": self.healthy,
+                "requests": self.requests,
+                "failures": self.failures,
+                "ewma_ms": round(self.ewma * 1e3, 1) if self.ewma is not None else None,
+                "p95_ms": round(p95 * 1e3, 1) if p95 is not None else None,
+            }
+
+
+class _AttemptFailed(Exception):
+    def __init__(self, error, retryable, connection_failed=False):
+        super().__init__(str(error))
+        self.error = error
+        self.retryable = retryable
+        # The request never reached the node, so any call may be sent elsewhere
+        self.connection_failed = connection_failed
+
+
+class GatewayClient:
+    """
+    Shared HTTP client for one or more MultiversX gateway nodes.
+
+    All calls go through one `requests.Session`, so TCP/TLS connections are kept
+    alive and reused from a sized pool. Idempotent calls are retried a bounded
+    number of times with jittered exponential backoff.
+
+    With several nodes, calls go to the healthiest, fastest node first.
+    Idempotent reads are hedged: if the first node has not answered within its
+    recent latency percentile, the same request goes to the next node and the
+    first successful answer wins. Writes move to another node only when the
+    connection could not be established.
+
+    With a `scheduler`, every HTTP attempt first takes a rate limit token at the
+    call's priority: writes are sent at `SEND`, other calls at the priority the
+    calling thread set on the scheduler (`READ` by default). Hedges are only
+    sent when a token is free right away.
+    """
+
+    def __init__(self, base_url, pool_connections=4, pool_maxsize=32, timeout=(3.05, 10.0), max_retries=3, backoff=0.25,
+                 hedge_percentile=0.95, hedge_min_delay=0.05, hedge_max_delay=2.0, hedge_max_workers=128, scheduler=None,
+                 pool_block=True):
+        """
+        :param base_url: Gateway URL, or a list (or comma-separated string) of gateway URLs.
+        :param hedge_percentile: Latency percentile of the first node after which a read is hedged.
+        :param hedge_min_delay: Lower bound of the hedging delay in seconds.
+        :param hedge_max_delay: Upper bound of the hedging delay, also used until enough latencies are known.
+        :param hedge_max_workers: Threads available to run hedged reads.
+        :param scheduler: Optional `UpstreamScheduler` rate limiting the calls.
+        :param pool_block: Wait for a free pooled connection instead of opening (and then discarding) an extra one.
+        """
+        urls = base_url.split(",") if isinstance(base_url, str) else base_url
+        self.endpoints = [GatewayEndpoint(url.strip()) for url in urls if url.strip()]
+        self.base_url = self.endpoints[0].base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_max_delay = hedge_max_delay
+        self.scheduler = scheduler
+
+        if len(self.endpoints) > 1:
+            # Every hedge worker may hold a connection to the same node
+            pool_maxsize = max(pool_maxsize, hedge_max_workers)
+        self.adapter = HTTPAdapter(
+            pool_connections=max(pool_connections, len(self.endpoints)),
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=0,
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+
+        # Only needed to race nodes against each other
+        self._hedge_executor = None
+        if len(self.endpoints) > 1:
+            self._hedge_executor = ThreadPoolExecutor(max_workers=hedge_max_workers, thread_name_prefix="gateway-hedge")
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._failures = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+        self._failovers = 0
+
+    def ordered_endpoints(self):
+        """
+        Nodes in the order they should be tried: healthy ones first, fastest first.
+        """
+        return sorted(self.endpoints, key=lambda endpoint: (not endpoint.healthy, endpoint.ewma or 0.0))
+
+    def request(self, method, path, idempotent=True, timeout=None, priority=None, **kwargs):
+        """
+        Perform a gateway call and return the decoded JSON body.
+
+        Idempotent calls are retried on connection errors, timeouts and retryable
+        status codes. Other calls are only retried when the connection could not
+        be established, since the request then never reached the gateway.
+
+        :param priority: Scheduler priority of the call (see `scheduler`); chosen from the call when omitted.
+        """
+        route = gateway_route(path)
+        if priority is None:
+            priority = SEND if not idempotent else self.scheduler.current_priority() if self.scheduler else READ
+        attempt = 0
+
+        while True:
+            try:
+                if idempotent and self._hedge_executor is not None:
+                    return self._hedged_call(method, path, route, priority, timeout, kwargs)
+                return self._failover_call(method, path, route, idempotent, priority, timeout, kwargs)
+            except _AttemptFailed as failure:
+                if not failure.retryable or attempt >= self.max_retries:
+                    with self._lock:
+                        self._failures += 1
+                    raise failure.error
+
+            with self._lock:
+                self._retries += 1
+            GATEWAY_RETRIES.inc(route=route, method=method)
+            # Full jitter keeps concurrent retries from hitting the gateway in lockstep
+            time.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+            attempt += 1
+
+    def _call(self, endpoint, method, path, route, idempotent, priority, timeout, kwargs, scheduled=False):
+        """
+        One HTTP call to one node. Returns the decoded JSON body or raises `_AttemptFailed`.
+
+        :param scheduled: True if the caller already took the scheduler token.
+        """
+        if self.scheduler is not None and not scheduled:
+            self.scheduler.acquire(priority)
+        url = f"{endpoint.base_url}/{path.lstrip('/')}"
+        with self._lock:
+            self._requests += 1
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+        except requests.exceptions.ConnectionError as e:
+            failure, outcome = _AttemptFailed(GatewayError(f"Gateway unreachable: {e}"), True, connection_failed=True), "unreachable"
+        except requests.exceptions.Timeout as e:
+            failure, outcome = _AttemptFailed(GatewayError(f"Gateway timed out: {e}"), idempotent), "timeout"
+        else:
+            elapsed = time.perf_counter() - started
+            GATEWAY_LATENCY.observe(elapsed, route=route, method=method)
+            if response.status_code == 200:
+                GATEWAY_REQUESTS.inc(route=route, method=method, outcome="ok")
+                endpoint.record_success(elapsed)
+                return response.json()
+            GATEWAY_REQUESTS.inc(route=route, method=method, outcome=f"http_{response.status_code}")
+            if response.status_code == 429 and self.scheduler is not None:
+                self.scheduler.throttle(_retry_after(response))
+            retryable_status = response.status_code in RETRY_STATUS_CODES
+            if retryable_status:
+                endpoint.record_failure()
+            else:
+                # The node answered properly; the request itself was refused
+                endpoint.record_success(elapsed)
+            raise _AttemptFailed(GatewayError(_error_message(response), response.status_code), idempotent and retryable_status)
+
+        GATEWAY_LATENCY.observe(time.perf_counter() - started, route=route, method=method)
+        GATEWAY_REQUESTS.inc(route=route, method=method, outcome=outcome)
+        endpoint.record_failure()
+        raise failure
+
+    def _failover_call(self, method, path, route, idempotent, priority, timeout, kwargs):
+        """
+        Try the nodes in order, moving on only when a connection could not be established.
+        """
+        endpoints = self.ordered_endpoints()
+        for index, endpoint in enumerate(endpoints):
+            try:
+                return self._call(endpoint, method, path, route, idempotent, priority, timeout, kwargs)
+            except _AttemptFailed as failure:
+                if not failure.connection_failed or index == len(endpoints) - 1:
+                    raise
+                with self._lock:
+                    self._failovers += 1
+
+    def _hedge_delay(self, endpoint):
+        latency = endpoint.latency_percentile(self.hedge_percentile)
+        if latency is None:
+            return self.hedge_max_delay
+        return min(self.hedge_max_delay, max(self.hedge_min_delay, latency))
+
+    def _hedged_call(self, method, path, route, priority, timeout, kwargs):
+        """
+        Send an idempotent read to the best node, and to the next one if the first is slow or fails.
+        """
+        endpoints = self.ordered_endpoints()
+        pending = {}
+        last_failure = None
+
+        def launch(endpoint, scheduled=False):
+            # Wait for the token in this thread, where the scheduler orders callers by
+            # priority, rather than in the executor's first-come queue
+            if self.scheduler is not None and not scheduled:
+                self.scheduler.acquire(priority)
+            future = self._hedge_executor.submit(self._call, endpoint, method, path, route, True, priority, timeout, kwargs, True)
+            pending[future] = endpoint
+
+        primary = endpoints.pop(0)
+        launch(primary)
+        delay = self._hedge_delay(primary)
+        while pending:
+            done, _ = wait(pending, timeout=delay if endpoints else None, return_when=FIRST_COMPLETED)
+            if not done:
+                delay = None
+                # A hedge is an extra call; it must not wait behind the rate limit
+                if self.scheduler is not None and not self.scheduler.try_acquire(priority):
+                    continue
+                # Slow first answer: race the next node
+                with self._lock:
+                    self._hedged += 1
+                GATEWAY_HEDGES.inc(route=route)
+                launch(endpoints.pop(0), scheduled=True)
+                continue
+
+            for future in done:
+                endpoint = pending.pop(future)
+                try:
+                    result = future.result()
+                except _AttemptFailed as failure:
+                    last_failure = failure
+                    continue
+                if endpoint is not primary:
+                    with self._lock:
+                        self._hedge_wins += 1
+                return result
+
+            # Every finished call failed: fail over at once if nothing else is running
+            if not pending and endpoints and last_failure.retryable:
+                with self._lock:
+                    self._failovers += 1
+                launch(endpoints.pop(0))
+                delay = self._hedge_delay(next(iter(pending.values())))
+
+        raise last_failure
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, payload, idempotent=False, **kwargs):
+        return self.request("POST", path, idempotent=idempotent, json=payload, **kwargs)
+
+    def get_transaction(self, tx_hash, with_results=True):
+        """
+        Fetch a transaction (and optionally its smart contract results).
+        """
+        return self.get(f"transaction/{tx_hash}", params={"withResults": "true" if with_results else "false"})
+
+    def get_account_nonce(self, address):
+        """
+        Fetch the current nonce of an account.
+        """
+        data = self.get(f"address/{address.to_bech32()}")
+        return data["data"]["account"]["nonce"]
+
+    def send_transaction(self, tx):
+        """
+        Broadcast a signed transaction and return its hash.
+        """
+        data = self.post("transaction/send", tx.to_dictionary())
+        return data["data"]["txHash"]
+
+    def send_transactions(self, txs):
+        """
+        Broadcast many signed transactions in one call.
+
+        :return: List with the hash of each transaction, or None where the gateway rejected it.
+        """
+        data = self.post("transaction/send-multiple", [tx.to_dictionary() for tx in txs])
+        hashes = data["data"].get("txsHashes") or {}
+        return [hashes.get(str(index)) for index in range(len(txs))]
+
+    def get_account_transactions(self, address, after=None, start=0, size=50):
+        """
+        List the transactions of an account, oldest first, with their smart contract results.
+        This is an API route (`/accounts/<address>/transactions`), not a gateway one.
+
+        :param address: Bech32 address of the account.
+        :param after: Only return transactions with a timestamp at or after this one.
+        :param start: Offset of the first transaction to return.
+        :param size: Maximum number of transactions to return.
+        :return: List of transactions in the API layout (result data base64-encoded).
+        """
+        params = {"from": start, "size": size, "order": "asc", "withScResults": "true"}
+        if after is not None:
+            params["after"] = after
+        return self.get(f"accounts/{address}/transactions", params=params)
+
+    def query_contract(self, contract, function, arguments=(), caller=None):
+        """
+        Run a contract view through the gateway VM query route and return the raw return data.
+
+        :param contract: Bech32 address of the contract.
+        :param function: Name of the view (or endpoint) to run.
+        :param arguments: Hex-encoded arguments.
+        :param caller: Optional bech32 address the query is run as.
+        :return: List of base64-encoded return values.
+        """
+        payload = {"scAddress": contract, "funcName": function, "args": list(arguments)}
+        if caller:
+            payload["caller"] = caller
+
+        data = self.post("vm-values/query", payload, idempotent=True)["data"]["data"]
+        if data.get("returnCode") != "ok":
+            raise ContractQueryError(function, data.get("returnCode"), data.get("returnMessage"))
+        return data.get("returnData") or []
+
+    def stats(self):
+        """
+        Report request, retry and connection reuse statistics.
+        """
+        connections = 0
+        http_requests = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += pool.num_connections
+            http_requests += pool.num_requests
+
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "retries": self._retries,
+                "failures": self._failures,
+                "connections_opened": connections,
+                "connections_reused": max(0, http_requests - connections),
+                "reuse_ratio": round(1 - connections / http_requests, 4) if http_requests else 0.0,
+                "hedged": self._hedged,
+                "hedge_wins": self._hedge_wins,
+                "failovers": self._failovers,
+                "endpoints": [endpoint.stats() for endpoint in self.endpoints],
+            }
+
+
+def gateway_route(path):
+    """
+    Metric label for a gateway path, with hashes and addresses collapsed
+    (`transaction/<hash>` -> `transaction/:id`).
+    """
+    parts = path.strip("/").split("/")
+    if len(parts) == 2 and parts[0] in ("transaction", "address") and parts[1] not in ("send", "send-multiple"):
+        return f"{parts[0]}/:id"
+    if len(parts) == 3 and parts[0] == "accounts":
+        return f"accounts/:id/{parts[2]}"
+    return "/".join(parts)
+
+
+def _error_message(response):
+    """
+    Extract the gateway error message from a failed response.
+    """
+    try:
+        message = response.json().get("error")
+    except ValueError:
+        message = None
+    return message or f"Gateway returned HTTP {response.status_code}"
+
+
+def _retry_after(response, default=1.0):
+    """
+    Seconds to hold back after a 429, from the Retry-After header when it gives a number.
+    """
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", default)))
+    except ValueError:
+        return default
@@ -0,0 +1,304 @@
+import base64
+import json
+import sqlite3
+import threading
+
+from codec import decode_transaction
+from confirmation import FAILED_STATUSES
+
+# Contract endpoints whose results are decoded and numbered per sender
+GENERATE_TEST = "generate_test"
+SUBMIT_TEST = "submit_test"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    tx_hash TEXT PRIMARY KEY,
+    contract TEXT NOT NULL,
+    sender TEXT NOT NULL,
+    function TEXT,
+    nonce INTEGER,
+    timestamp INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    test_number INTEGER,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_by_sender ON transactions (contract, sender, test_number);
+CREATE TABLE IF NOT EXISTS cursors (
+    contract TEXT PRIMARY KEY,
+    timestamp INTEGER NOT NULL
+);
+"""
+
+
+def api_transaction(item):
+    """
+    Convert a transaction listed by the API into the gateway layout `decode_transaction` expects.
+    """
+    return {
+        "status": item.get("status"),
+        "smartContractResults": [
+            {"data": base64.b64decode(result["data"]).decode("ascii", errors="replace")}
+            for result in item.get("results") or []
+            if result.get("data")
+        ],
+    }
+
+
+def call_function(item):
+    """
+    Name of the contract function a listed transaction called.
+    """
+    if item.get("function"):
+        return item["function"]
+    data = base64.b64decode(item.get("data") or "").decode("ascii", errors="replace")
+    return data.split("@", 1)[0] or None
+
+
+def _collect_tests(rows):
+    """
+    Fold indexed `(key, contract, function, tx_hash, test_number, record)` rows into one dict per test.
+
+    :return: Dict of tests by row key, in row order.
+    """
+    tests = {}
+    for key, contract_address, function, tx_hash, test_number, record in rows:
+        record = json.loads(record)
+        test = tests.setdefault(key, {
+            "contract_address": contract_address,
+            "test_number": test_number,
+            "generate_tx_hash": None,
+            "operations": None,
+            "submit_tx_hash": None,
+            "correct_answers": None,
+            "wrong_questions": None,
+        })
+        if function == GENERATE_TEST:
+            test["generate_tx_hash"] = tx_hash
+            test["operations"] = record["operations"]
+        else:
+            test["submit_tx_hash"] = tx_hash
+            test["correct_answers"] = record["correct_answers"]
+            test["wrong_questions"] = record["wrong_questions"]
+    return tests
+
+
+class ContractIndexer:
+    """
+    Background indexer of contract transactions into a local SQLite store.
+
+    Every followed contract is polled incrementally from a persisted timestamp
+    cursor. Final `generate_test` and `submit_test` transactions are decoded
+    once and stored with their sender and test number, so result lookups are
+    answered locally. A transaction that is not final yet stops the pass for
+    that contract; the cursor never moves past it, so it is picked up later.
+    """
+
+    def __init__(self, fetch_page, db_path, poll_interval=5.0, page_size=50, max_pages=20, on_indexed=None):
+        """
+        :param fetch_page: Callable `(contract, after, start, size)` returning listed transactions, oldest first.
+        :param db_path: Path of the SQLite database.
+        :param poll_interval: Seconds between passes over the followed contracts.
+        :param page_size: Transactions requested per page.
+        :param max_pages: Upper bound on pages fetched per contract and pass.
+        :param on_indexed: Optional callable `(contract, function, sender, tx_hash, record)` run for every newly indexed transaction.
+        """
+        self.fetch_page = fetch_page
+        self.poll_interval = poll_interval
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.on_indexed = on_indexed
+
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+        self._lock = threading.Lock()
+
+        self._contracts = set()
+        self._thread = None
+        self._stop = threading.Event()
+
+        # Counted once here and kept up to date by _store, so stats() never scans the table
+        self.transactions = self._db.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+        self.passes = 0
+        self.errors = 0
+        self.indexed = 0
+        self.hits = 0
+        self.misses = 0
+
+    def follow(self, contract):
+        """
+        Start indexing a contract (and the background thread, on first use).
+        """
+        with self._lock:
+            self._contracts.add(contract)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="indexer", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.poll_interval)
+
+    def run_once(self):
+        """
+        Index new transactions of every followed contract.
+
+        :return: Number of newly indexed transactions.
+        """
+        with self._lock:
+            contracts = list(self._contracts)
+
+        indexed = 0
+        for contract in contracts:
+            try:
+                indexed += self.index_contract(contract)
+            except Exception:
+                with self._lock:
+                    self.errors += 1
+        with self._lock:
+            self.passes += 1
+        return indexed
+
+    def index_contract(self, contract):
+        """
+        Fetch and store the transactions of a contract listed since its cursor.
+
+        :return: Number of newly indexed transactions.
+        """
+        cursor = self.cursor(contract)
+        newest = cursor
+        indexed = 0
+
+        for page_number in range(self.max_pages):
+            page = self.fetch_page(contract, cursor, page_number * self.page_size, self.page_size)
+            for item in page:
+                record = decode_transaction(api_transaction(item))
+                if not self._is_final(item, record):
+                    self._save_cursor(contract, newest)
+                    return indexed
+                if self._store(contract, item, record):
+                    indexed += 1
+                    if self.on_indexed is not None:
+                        self.on_indexed(contract, call_function(item), item.get("sender"), item["txHash"], record)
+                newest = max(newest or 0, item.get("timestamp") or 0)
+            if len(page) < self.page_size:
+                break
+
+        self._save_cursor(contract, newest)
+        return indexed
+
+    def _is_final(self, item, record):
+        if record["final"]:
+            return True
+        # Calls of other endpoints do not have to return anything
+        return item.get("status") == "success" and call_function(item) not in (GENERATE_TEST, SUBMIT_TEST)
+
+    def _store(self, contract, item, record):
+        function = call_function(item)
+        sender = item.get("sender")
+
+        # The connection context commits (or rolls back) the transaction on every path
+        with self._lock, self._db:
+            if self._db.execute("SELECT 1 FROM transactions WHERE tx_hash = ?", (item["txHash"],)).fetchone():
+                return False
+
+            test_number = None
+            if record["status"] not in FAILED_STATUSES:
+                latest = self._db.execute(
+                    "SELECT MAX(test_number) FROM transactions WHERE contract = ? AND sender = ? AND function = ? AND test_number IS NOT NULL",
+                    (contract, sender, GENERATE_TEST),
+                ).fetchone()[0] or 0
+                if function == GENERATE_TEST:
+                    test_number = latest + 1
+                elif function == SUBMIT_TEST and latest:
+                    test_number = latest
+
+            self._db.execute(
+                "INSERT INTO transactions (tx_hash, contract, sender, function, nonce, timestamp, status, test_number, record) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (item["txHash"], contract, sender, function, item.get("nonce"), item.get("timestamp") or 0,
+                 record["status"], test_number, json.dumps(record)),
+            )
+            self.indexed += 1
+            self.transactions += 1
+            return True
+
+    def cursor(self, contract):
+        """
+        Timestamp the next pass over a contract starts from (None before the first pass).
+        """
+        with self._lock:
+            row = self._db.execute("SELECT timestamp FROM cursors WHERE contract = ?", (contract,)).fetchone()
+        return row[0] if row else None
+
+    def _save_cursor(self, contract, timestamp):
+        if timestamp is None:
+            return
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO cursors (contract, timestamp) VALUES (?, ?)", (contract, timestamp))
+
+    def lookup(self, tx_hash):
+        """
+        Return the decoded record of an indexed transaction, or None if it is not indexed (yet).
+        """
+        with self._lock:
+            row = self._db.execute("SELECT record FROM transactions WHERE tx_hash = ?", (tx_hash,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def tests(self, sender, contract=None):
+        """
+        Return the indexed tests of a sender, ordered by test number.
+
+        :return: List of dicts with the test number, both tx hashes, operations and feedback.
+        """
+        query = "SELECT contract, function, tx_hash, test_number, record FROM transactions WHERE sender = ? AND test_number IS NOT NULL"
+        params = [sender]
+        if contract:
+            query += " AND contract = ?"
+            params.append(contract)
+
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY contract, test_number, timestamp", params).fetchall()
+        return list(_collect_tests(((row[0], row[3]), *row) for row in rows).values())
+
+    def latest_tests(self, contract, senders):
+        """
+        Return the latest indexed test of each of several senders of a contract, in one query.
+
+        :return: Dict keyed by sender; senders without an indexed test are left out.
+        """
+        if not senders:
+            return {}
+        placeholders = ", ".join("?" for _ in senders)
+        query = (
+            "SELECT t.sender, t.contract, t.function, t.tx_hash, t.test_number, t.record FROM transactions t "
+            "JOIN (SELECT sender, MAX(test_number) AS test_number FROM transactions "
+            f"WHERE contract = ? AND sender IN ({placeholders}) AND test_number IS NOT NULL GROUP BY sender) latest "
+            "ON t.sender = latest.sender AND t.test_number = latest.test_number "
+            "WHERE t.contract = ? ORDER BY t.sender, t.timestamp"
+        )
+        with self._lock:
+            rows = self._db.execute(query, [contract, *senders, contract]).fetchall()
+        return _collect_tests(rows)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "contracts": len(self._contracts),
+                "transactions": self.transactions,
+                "indexed": self.indexed,
+                "passes": self.passes,
+                "errors": self.errors,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
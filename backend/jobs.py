@@ -0,0 +1,126 @@
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Job states; the last two are terminal
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class Job:
+    """
+    A unit of background work (e.g. waiting for a transaction to confirm).
+    """
+
+    def __init__(self, kind, tx_hash=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.tx_hash = tx_hash
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.error_status = None
+        self.version = 0
+        self.updated_at = time.monotonic()
+
+    @property
+    def done(self):
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "tx_hash": self.tx_hash,
+            "result": self.result,
+            "error": self.error,
+            "error_status": self.error_status,
+        }
+
+
+class JobManager:
+    """
+    Runs jobs on a background executor and lets clients poll or subscribe to their state.
+    """
+
+    def __init__(self, max_workers=32, retention=600.0):
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._changed = threading.Condition()
+
+    def submit(self, kind, fn, tx_hash=None):
+        """
+        Queue `fn()` as a job. Its return value becomes the job result; an exception marks
+        the job failed (with the exception's `status` attribute as `error_status`, if any).
+        """
+        job = Job(kind, tx_hash)
+        with self._changed:
+            self._prune()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id):
+        with self._changed:
+            return self._jobs.get(job_id)
+
+    def wait(self, job, version, timeout):
+        """
+        Block until the job changes past `version` (or `timeout` elapses) and return its state.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: job.version != version, timeout=timeout)
+            return job.version, job.to_dict()
+
+    def events(self, job, heartbeat=15.0):
+        """
+        Yield server-sent events for every state change of a job until it is done.
+        """
+        version = None
+        while True:
+            new_version, state = self.wait(job, version, heartbeat)
+            if new_version == version:
+                # Keep idle connections alive through proxies
+                yield ": keep-alive\n\n"
+                continue
+            version = new_version
+            yield f"event: {state['status']}\ndata: {json.dumps(state)}\n\n"
+            if state["status"] in (SUCCEEDED, FAILED):
+                return
+
+    def stats(self):
+        with self._changed:
+            counts = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def _run(self, job, fn):
+        self._update(job, status=RUNNING)
+        try:
+            result = fn()
+        except Exception as e:
+            error_status = "timeout" if isinstance(e, TimeoutError) else getattr(e, "status", None)
+            self._update(job, status=FAILED, error=str(e), error_status=error_status)
+        else:
+            self._update(job, status=SUCCEEDED, result=result)
+
+    def _update(self, job, **changes):
+        with self._changed:
+            for name, value in changes.items():
+                setattr(job, name, value)
+            job.version += 1
+            job.updated_at = time.monotonic()
+            self._changed.notify_all()
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.retention
+        expired = [job_id for job_id, job in self._jobs.items() if job.done and job.updated_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,396 @@
+"""
+Local stand-in for the MultiversX gateway, for load tests and offline development.
+
+Emulates the routes the backend uses, including the AssigningStudents
+contract logic of `src/project.rs`:
+
+* GET  /address/<bech32>                        account nonce
+* POST /transaction/send, /transaction/send-multiple
+* GET  /transaction/<hash>?withResults=true     pending until the next "block",
+                                                then `smartContractResults` shaped like
+                                                `generate_test` / `submit_test` returns
+* POST /vm-values/query                         `test_results` view (and dry runs of
+                                                the endpoints when a caller is given)
+* GET  /accounts/<bech32>/transactions          API-style transaction listing, oldest first
+                                                (`from`, `size`, `after`)
+
+Latency (including a slow tail), failures and a rate limit answered with
+HTTP 429 can be injected. Signatures are
+not verified. Several instances can share one `MockChain` to stand in for the
+nodes of one network.
+
+Run with: python mock_gateway.py --port 7950 --block-time 0.6 --latency 0.02
+"""
+import argparse
+import base64
+import hashlib
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from multiversx_sdk import Address
+
+from codec import QUESTIONS_PER_TEST, decode_answer, expected_answer
+
+MAX_TESTS = 5
+OK_PREFIX = "@6f6b@"
+
+
+class ContractError(Exception):
+    pass
+
+
+class MockChain:
+    """
+    In-memory accounts, transactions and AssigningStudents contract state.
+    """
+
+    def __init__(self, block_time=0.6, seed=None):
+        self.block_time = block_time
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.nonces = {}  # bech32 -> executed nonce
+        self.transactions = {}  # hash -> transaction dict
+        self.pending = {}  # (sender, nonce) -> hash of a pending transaction
+        self.tests = {}  # (contract, sender) -> {"operations", "num_tests", "can_submit", "score"}
+        self.counter = itertools.count()
+
+    # -- contract logic (mirrors src/project.rs) --
+
+    def state(self, contract, sender):
+        return self.tests.setdefault((contract, sender), {"operations": None, "num_tests": 0, "can_submit": False, "score": 0})
+
+    def generate_test(self, contract, sender, commit=True):
+        state = self.state(contract, sender)
+        if state["num_tests"] >= MAX_TESTS:
+            raise ContractError("You have already generated 5 tests. You finished your homework.")
+        if state["can_submit"]:
+            raise ContractError("You have already generated a test. You can't generate another one until you solve it.")
+        if not commit:
+            return b""
+
+        operations = bytearray()
+        for _ in range(QUESTIONS_PER_TEST):
+            num1, num2 = self.random.randrange(9), self.random.randrange(9)
+            operator = b"+-*/"[self.random.randrange(9) % 4]
+            if operator == ord("/") and num2 == 0:
+                num2 = 1
+            operations += bytes([num1, 32, operator, 32, num2, 0])
+
+        state["operations"] = bytes(operations)
+        state["num_tests"] += 1
+        state["can_submit"] = True
+        return bytes(operations)
+
+    def submit_test(self, contract, sender, answers, commit=True):
+        state = self.state(contract, sender)
+        if not state["can_submit"]:
+            raise ContractError("You have already submitted your answers. You can't submit again.")
+        if not commit:
+            return b""
+
+        feedback = bytearray()
+        for question in range(QUESTIONS_PER_TEST):
+            operation = state["operations"][question * 6:question * 6 + 6]
+            expected = expected_answer(operation[0], chr(operation[2]), operation[4])
+            answer = decode_answer(answers[question]) if question < len(answers) else 0
+            if answer == expected:
+                state["score"] += 4
+                feedback += b"Correct".ljust(12, b"\0")
+            else:
+                feedback += b"Incorrect".ljust(12, b"\0")
+
+        state["can_submit"] = False
+        return bytes(feedback)
+
+    def run_call(self, contract, sender, data, commit=True):
+        function, _, arguments = data.partition("@")
+        if function == "generate_test":
+            return self.generate_test(contract, sender, commit)
+        if function == "submit_test":
+            return self.submit_test(contract, sender, bytes.fromhex(arguments), commit)
+        raise ContractError(f"invalid function (not found): {function}")
+
+    # -- transactions --
+
+    def account_nonce(self, address):
+        with self.lock:
+            return self.nonces.get(address, 0)
+
+    def send(self, tx):
+        with self.lock:
+            sender = tx["sender"]
+            nonce = tx.get("nonce", 0)
+            if nonce < self.nonces.get(sender, 0):
+                raise ValueError("transaction generation failed: lowerNonceInTx: true")
+            if (sender, nonce) in self.pending:
+                raise ValueError("transaction generation failed: duplicated nonce (tx already in pool)")
+
+            tx_hash = hashlib.sha256(f"{json.dumps(tx, sort_keys=True)}{next(self.counter)}".encode()).hexdigest()
+            data = base64.b64decode(tx.get("data") or "").decode()
+            self.transactions[tx_hash] = {
+                "hash": tx_hash,
+                "sender": sender,
+                "receiver": tx["receiver"],
+                "nonce": nonce,
+                "data": data,
+                "status": "pending",
+                "execute_at": time.monotonic() + self.block_time,
+                "timestamp": int(time.time()),
+                "smartContractResults": [],
+                "logs": None,
+            }
+            self.pending[(sender, nonce)] = tx_hash
+            return tx_hash
+
+    def transaction(self, tx_hash):
+        with self.lock:
+            tx = self.transactions.get(tx_hash)
+            if tx is None:
+                return None
+            if tx["status"] == "pending" and time.monotonic() >= tx["execute_at"]:
+                self._execute(tx)
+            return {key: value for key, value in tx.items() if key != "execute_at"}
+
+    def _execute(self, tx):
+        # Nonces execute in order; a later nonce waits for the earlier ones
+        sender = tx["sender"]
+        if tx["nonce"] > self.nonces.get(sender, 0):
+            return
+        self.nonces[sender] = tx["nonce"] + 1
+        del self.pending[(sender, tx["nonce"])]
+
+        try:
+            result = self.run_call(tx["receiver"], sender, tx["data"])
+        except ContractError as e:
+            tx["status"] = "fail"
+            tx["logs"] = {"events": [{
+                "identifier": "signalError",
+                "topics": [base64.b64encode(Address.from_bech32(sender).get_public_key()).decode(), base64.b64encode(str(e).encode()).decode()],
+            }]}
+            self._execute_next(sender)
+            return
+
+        tx["status"] = "success"
+        tx["smartContractResults"] = [{
+            "hash": hashlib.sha256(tx["hash"].encode()).hexdigest(),
+            "sender": tx["receiver"],
+            "receiver": sender,
+            "data": OK_PREFIX + result.hex(),
+        }]
+
+        self._execute_next(sender)
+
+    def _execute_next(self, sender):
+        # Unblock the next queued nonce of the same sender
+        next_hash = self.pending.get((sender, self.nonces[sender]))
+        if next_hash is not None and time.monotonic() >= self.transactions[next_hash]["execute_at"]:
+            self._execute(self.transactions[next_hash])
+
+    def account_transactions(self, address, after=None, start=0, size=50):
+        with self.lock:
+            listed = []
+            for tx in self.transactions.values():
+                if address not in (tx["sender"], tx["receiver"]) or (after is not None and tx["timestamp"] < after):
+                    continue
+                if tx["status"] == "pending" and time.monotonic() >= tx["execute_at"]:
+                    self._execute(tx)
+                listed.append({
+                    "txHash": tx["hash"],
+                    "sender": tx["sender"],
+                    "receiver": tx["receiver"],
+                    "nonce": tx["nonce"],
+                    "timestamp": tx["timestamp"],
+                    "status": tx["status"],
+                    "function": tx["data"].split("@", 1)[0],
+                    "data": base64.b64encode(tx["data"].encode()).decode(),
+                    "results": [{"hash": result["hash"], "data": base64.b64encode(result["data"].encode()).decode()} for result in tx["smartContractResults"]],
+                })
+            return listed[start:start + size]
+
+    def query(self, contract, function, arguments, caller=None):
+        with self.lock:
+            if function == "test_results":
+                user = Address.from_hex(arguments[0], "erd").to_bech32()
+                score = self.state(contract, user)["score"]
+                return [base64.b64encode(score.to_bytes((score.bit_length() + 7) // 8, "big")).decode()]
+
+            # Dry run of an endpoint: check its requirements without committing
+            data = "@".join([function, *arguments])
+            self.run_call(contract, caller, data, commit=False)
+            return []
+
+
+class MockGatewayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, payload, status=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def error(self, message, status=400):
+        self.reply({"data": None, "error": message, "code": "bad_request"}, status)
+
+    def inject(self):
+        """
+        Apply the configured latency and failure injection. Returns False if the request was failed.
+        """
+        server = self.server
+        if not server.take_token():
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return False
+        if server.latency:
+            time.sleep(max(0.0, random.gauss(server.latency, server.latency * server.jitter)))
+        if server.tail_rate and random.random() < server.tail_rate:
+            time.sleep(server.tail_latency)
+        if server.failure_rate and random.random() < server.failure_rate:
+            self.error("injected failure", 503)
+            return False
+        return True
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"null")
+
+    def do_GET(self):
+        if not self.inject():
+            return
+        chain = self.server.chain
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+
+        if len(parts) == 2 and parts[0] == "address":
+            return self.reply({"data": {"account": {"address": parts[1], "nonce": chain.account_nonce(parts[1]), "balance": "0"}}, "code": "successful"})
+
+        if len(parts) == 2 and parts[0] == "transaction":
+            tx = chain.transaction(parts[1])
+            if tx is None:
+                return self.error("transaction not found", 404)
+            if parse_qs(url.query).get("withResults") != ["true"]:
+                tx = {key: value for key, value in tx.items() if key not in ("smartContractResults", "logs")}
+            return self.reply({"data": {"transaction": tx}, "code": "successful"})
+
+        if len(parts) == 3 and parts[0] == "accounts" and parts[2] == "transactions":
+            query = parse_qs(url.query)
+            after = int(query["after"][0]) if "after" in query else None
+            start = int(query.get("from", ["0"])[0])
+            size = int(query.get("size", ["25"])[0])
+            return self.reply(chain.account_transactions(parts[1], after, start, size))
+
+        self.error("route not found", 404)
+
+    def do_POST(self):
+        if not self.inject():
+            return
+        chain = self.server.chain
+        path = urlparse(self.path).path.strip("/")
+        try:
+            body = self.read_json()
+        except ValueError:
+            return self.error("invalid JSON")
+
+        try:
+            if path == "transaction/send":
+                return self.reply({"data": {"txHash": chain.send(body)}, "code": "successful"})
+
+            if path == "transaction/send-multiple":
+                hashes = {}
+                for index, tx in enumerate(body):
+                    try:
+                        hashes[str(index)] = chain.send(tx)
+                    except ValueError:
+                        pass
+                return self.reply({"data": {"numOfSentTxs": len(hashes), "txsHashes": hashes}, "code": "successful"})
+        except ValueError as e:
+            return self.error(str(e))
+
+        if path == "vm-values/query":
+            try:
+                return_data = chain.query(body["scAddress"], body["funcName"], body.get("args") or [], body.get("caller"))
+                result = {"returnData": return_data, "returnCode": "ok", "returnMessage": ""}
+            except ContractError as e:
+                result = {"returnData": None, "returnCode": "user error", "returnMessage": str(e)}
+            return self.reply({"data": {"data": result}, "code": "successful"})
+
+        self.error("route not found", 404)
+
+
+class MockGateway(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, block_time=0.6, latency=0.0, jitter=0.2, failure_rate=0.0, seed=None, chain=None,
+                 tail_rate=0.0, tail_latency=1.0, rate_limit=0.0):
+        super().__init__(("127.0.0.1", port), MockGatewayHandler)
+        self.chain = chain or MockChain(block_time=block_time, seed=seed)
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        # Token bucket of the rate limit (one second's worth of burst)
+        self.rate_limit = rate_limit
+        self.rate_limited = 0
+        self._tokens = rate_limit
+        self._tokens_updated = time.monotonic()
+        self._tokens_lock = threading.Lock()
+
+    def take_token(self):
+        if not self.rate_limit:
+            return True
+        with self._tokens_lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._tokens_updated) * self.rate_limit)
+            self._tokens_updated = now
+            if self._tokens < 1:
+                self.rate_limited += 1
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def start(self):
+        """
+        Serve on a background thread and return the gateway URL.
+        """
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self.url
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=7950)
+    parser.add_argument("--block-time", type=float, default=0.6, help="seconds until a sent transaction executes")
+    parser.add_argument("--latency", type=float, default=0.0, help="mean added latency per request in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="latency standard deviation as a fraction of the mean")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 503")
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="fraction of requests delayed by --tail-latency")
+    parser.add_argument("--tail-latency", type=float, default=1.0, help="extra delay of slow requests in seconds")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requests per second before answering HTTP 429 (0: unlimited)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    gateway = MockGateway(args.port, args.block_time, args.latency, args.jitter, args.failure_rate, args.seed,
+                          tail_rate=args.tail_rate, tail_latency=args.tail_latency, rate_limit=args.rate_limit)
+    print(f"Mock gateway listening on {gateway.url}")
+    gateway.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import threading
+
+# Substrings of gateway errors caused by a stale or colliding nonce (lowerNonceInTx,
+# duplicated nonce, ...). Nodes prefix every rejected send with "transaction
+# generation failed", so that prefix alone says nothing about the nonce.
+NONCE_ERROR_MARKERS = ("nonce",)
+
+
+def is_nonce_error(error):
+    """
+    Whether a send error was caused by a stale or colliding nonce.
+    """
+    message = str(error).lower()
+    return any(marker in message for marker in NONCE_ERROR_MARKERS)
+
+
+class NonceManager:
+    """
+    Hands out account nonces locally.
+
+    Each sender is seeded from the gateway once; afterwards nonces are
+    incremented in memory, so back-to-back transactions of one sender get
+    distinct nonces without a read before every send. A sender is reseeded
+    when the gateway rejects one of its transactions because of its nonce.
+    """
+
+    def __init__(self, fetch_nonce):
+        self.fetch_nonce = fetch_nonce
+        self._next = {}  # bech32 -> next nonce to hand out
+        self._locks = {}  # bech32 -> lock guarding that sender
+        self._lock = threading.Lock()
+
+        self.seeds = 0
+        self.resyncs = 0
+
+    def _sender_lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def next_nonce(self, address):
+        """
+        Reserve the next nonce of `address`.
+        """
+        return self.next_nonces(address, 1)[0]
+
+    def next_nonces(self, address, count):
+        """
+        Reserve `count` consecutive nonces of `address`.
+        """
+        key = address.to_bech32()
+        with self._sender_lock(key):
+            first = self._next.get(key)
+            if first is None:
+                first = self.fetch_nonce(address)
+                self.seeds += 1
+            self._next[key] = first + count
+            return list(range(first, first + count))
+
+    def is_seeded(self, address):
+        key = address.to_bech32()
+        with self._sender_lock(key):
+            return key in self._next
+
+    def seed(self, address, nonce):
+        """
+        Seed the nonce of `address` unless it already has one.
+        Used by callers that read the account nonce themselves (e.g. asynchronously).
+        """
+        key = address.to_bech32()
+        with self._sender_lock(key):
+            if key not in self._next:
+                self._next[key] = nonce
+                self.seeds += 1
+
+    def resync(self, address):
+        """
+        Forget the local nonce of `address` so the next one is read from the gateway again.
+        """
+        key = address.to_bech32()
+        with self._sender_lock(key):
+            self._next.pop(key, None)
+            self.resyncs += 1
+
+    def stats(self):
+        with self._lock:
+            return {"senders": len(self._next), "seeds": self.seeds, "resyncs": self.resyncs}
+
+    def send(self, address, build_and_send, retries=1):
+        """
+        Assign a nonce to a transaction and send it, resyncing and retrying once
+        if the gateway rejects the nonce.
+
+        :param address: Sender address.
+        :param build_and_send: Callable taking a nonce, signing and sending the transaction.
+        :return: Whatever `build_and_send` returns (the tx hash).
+        """
+        attempt = 0
+        while True:
+            nonce = self.next_nonce(address)
+            try:
+                return build_and_send(nonce)
+            except Exception as e:
+                if not self._recover(address, nonce, e, attempt, retries):
+                    raise
+                attempt += 1
+
+    async def send_async(self, address, fetch_nonce, build_and_send, retries=1):
+        """
+        Coroutine version of `send` for callers on an event loop.
+
+        :param fetch_nonce: Coroutine function `(address)` reading the account nonce, used to seed the sender.
+        :param build_and_send: Coroutine function taking a nonce, signing and sending the transaction.
+        """
+        attempt = 0
+        while True:
+            if not self.is_seeded(address):
+                self.seed(address, await fetch_nonce(address))
+            nonce = self.next_nonce(address)
+            try:
+                return await build_and_send(nonce)
+            except Exception as e:
+                if not self._recover(address, nonce, e, attempt, retries):
+                    raise
+                attempt += 1
+
+    def _recover(self, address, nonce, error, attempt, retries):
+        """
+        Put the sender's nonce back in order after a failed send.
+
+        :return: Whether the send should be retried with a new nonce.
+        """
+        if not is_nonce_error(error):
+            # Never leave a gap: later nonces would stay pending forever
+            if not self.release(address, nonce):
+                self.resync(address)
+            return False
+        self.resync(address)
+        return attempt < retries
+
+    def release(self, address, nonce):
+        """
+        Return an unused nonce if it is still the most recently reserved one.
+
+        :return: Whether the nonce could be returned.
+        """
+        key = address.to_bech32()
+        with self._sender_lock(key):
+            if self._next.get(key) != nonce + 1:
+                return False
+            self._next[key] = nonce
+            return True
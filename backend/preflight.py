@@ -0,0 +1,130 @@
+import threading
+import time
+
+from gateway import ContractQueryError
+
+# VM return code of a `require!` failure
+USER_ERROR = "user error"
+# Expired outcomes are dropped once the cache holds this many entries
+CACHE_PRUNE_SIZE = 10_000
+
+
+class PreflightRejected(Exception):
+    """
+    Raised when a dry run shows that the contract would reject a call.
+    """
+
+    def __init__(self, function, reason):
+        super().__init__(f"{function} would be rejected by the contract: {reason}")
+        self.function = function
+        self.reason = reason
+
+
+class Preflight:
+    """
+    Dry runs of contract calls before they are signed and sent.
+
+    A call is simulated through the gateway VM query route as the caller, which
+    runs the endpoint's `require!` checks without changing any state. Outcomes
+    are cached for a short time per (contract, caller, function) and dropped as
+    soon as a transaction of that caller is sent. While a caller has sent
+    transactions that are not final yet, its state is about to change, so no
+    check is made and the call goes through. Checks fail open: if the query
+    itself fails, the call is sent as before.
+    """
+
+    def __init__(self, gateway, ttl=5.0):
+        self.gateway = gateway
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._cache = {}  # (contract, caller, function) -> (reason or None, expires_at)
+        self._in_flight = {}  # (contract, caller) -> number of unsettled transactions
+
+        self.checks = 0
+        self.cache_hits = 0
+        self.rejections = 0
+        self.skipped = 0
+        self.errors = 0
+
+    def check(self, contract, caller, function, arguments=()):
+        """
+        Raise `PreflightRejected` if the contract would reject `function` called by `caller`.
+
+        :param contract: Bech32 address of the contract.
+        :param caller: Bech32 address of the caller.
+        :param function: Endpoint name.
+        :param arguments: Hex-encoded endpoint arguments.
+        """
+        key = (contract, caller, function)
+        with self._lock:
+            self.checks += 1
+            if self._in_flight.get((contract, caller)):
+                self.skipped += 1
+                return
+            cached = self._cache.get(key)
+            if cached is not None and cached[1] > time.monotonic():
+                self.cache_hits += 1
+                reason = cached[0]
+                if reason is not None:
+                    self.rejections += 1
+                    raise PreflightRejected(function, reason)
+                return
+
+        try:
+            self.gateway.query_contract(contract, function, arguments, caller=caller)
+            reason = None
+        except ContractQueryError as e:
+            if e.return_code != USER_ERROR:
+                with self._lock:
+                    self.errors += 1
+                return
+            reason = e.return_message
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            if len(self._cache) >= CACHE_PRUNE_SIZE:
+                self._cache = {cached_key: entry for cached_key, entry in self._cache.items() if entry[1] > now}
+            self._cache[key] = (reason, now + self.ttl)
+            if reason is not None:
+                self.rejections += 1
+        if reason is not None:
+            raise PreflightRejected(function, reason)
+
+    def sent(self, contract, caller):
+        """
+        Record a transaction sent by `caller`; its cached outcomes no longer hold.
+        """
+        with self._lock:
+            self._in_flight[(contract, caller)] = self._in_flight.get((contract, caller), 0) + 1
+            self._forget(contract, caller)
+
+    def settled(self, contract, caller):
+        """
+        Record that a transaction sent by `caller` is final (or was given up on).
+        """
+        with self._lock:
+            remaining = self._in_flight.get((contract, caller), 0) - 1
+            if remaining > 0:
+                self._in_flight[(contract, caller)] = remaining
+            else:
+                self._in_flight.pop((contract, caller), None)
+            self._forget(contract, caller)
+
+    def _forget(self, contract, caller):
+        for key in [key for key in self._cache if key[:2] == (contract, caller)]:
+            del self._cache[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "checks": self.checks,
+                "cache_hits": self.cache_hits,
+                "rejections": self.rejections,
+                "skipped": self.skipped,
+                "errors": self.errors,
+                "in_flight_callers": len(self._in_flight),
+            }
@@ -0,0 +1,171 @@
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+from metrics import registry
+
+# Priorities, most urgent first
+SEND = 0  # Transaction broadcasts
+CONFIRM = 1  # Confirmation polls of sent transactions
+READ = 2  # Lookups a user request is waiting on
+BULK = 3  # Background work (indexing, reconciliation)
+PRIORITY_NAMES = {SEND: "send", CONFIRM: "confirm", READ: "read", BULK: "bulk"}
+
+UPSTREAM_WAIT = registry.histogram(
+    "upstream_queue_wait_seconds",
+    "Time upstream calls waited for a rate limit token, by priority.",
+    ("upstream", "priority"),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+UPSTREAM_THROTTLED = registry.counter("upstream_throttled_total", "HTTP 429 answers that paused an upstream scheduler.", ("upstream",))
+
+
+class UpstreamScheduler:
+    """
+    Token-bucket rate limiter with priority queues for calls to one upstream.
+
+    Tokens accrue at `rate` per second up to `burst`. Every call takes one
+    token; when none is left, callers queue and are served strictly by
+    priority, then in arrival order, so transaction sends and confirmation
+    polls overtake queued bulk reads. A 429 from the upstream empties the
+    bucket and pauses it for the advertised time. With a rate of 0 the
+    scheduler only counts calls and never waits.
+    """
+
+    def __init__(self, name, rate=0.0, burst=None):
+        """
+        :param name: Upstream name, used as the metric label.
+        :param rate: Sustained calls per second (0 for no limit).
+        :param burst: Calls allowed at once after an idle period (default: one second's worth).
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._cond = threading.Condition()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._waiting = []  # heap of (priority, arrival)
+        self._arrivals = itertools.count()
+        self._local = threading.local()
+
+        self.granted = {priority: 0 for priority in PRIORITY_NAMES}
+        self.throttled = 0
+
+    @contextmanager
+    def priority(self, priority):
+        """
+        Run the enclosed calls made from this thread at `priority`.
+        """
+        previous = getattr(self._local, "priority", None)
+        self._local.priority = priority
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def bind(self, priority, fn):
+        """
+        Wrap `fn` so its calls (from any thread) run at `priority`.
+        """
+        def call(*args, **kwargs):
+            with self.priority(priority):
+                return fn(*args, **kwargs)
+        return call
+
+    def current_priority(self, default=READ):
+        """
+        Priority set by an enclosing `priority()` block of this thread, or `default`.
+        """
+        priority = getattr(self._local, "priority", None)
+        return default if priority is None else priority
+
+    def _refill(self, now):
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def acquire(self, priority=READ):
+        """
+        Block until a call at `priority` may be made.
+
+        :return: Seconds spent waiting.
+        """
+        started = time.monotonic()
+        with self._cond:
+            if self.rate > 0:
+                entry = (priority, next(self._arrivals))
+                heapq.heappush(self._waiting, entry)
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._waiting[0] == entry and self._tokens >= 1:
+                        heapq.heappop(self._waiting)
+                        self._tokens -= 1
+                        break
+                    # Only the head of the queue needs to wake up for the next token
+                    timeout = None
+                    if self._waiting[0] == entry:
+                        timeout = max(self._updated - now, 0.0) + (1 - self._tokens) / self.rate
+                    self._cond.wait(timeout)
+                # The next caller in line becomes the head
+                self._cond.notify_all()
+            self.granted[priority] += 1
+
+        waited = time.monotonic() - started
+        UPSTREAM_WAIT.observe(waited, upstream=self.name, priority=PRIORITY_NAMES[priority])
+        return waited
+
+    def try_acquire(self, priority=READ):
+        """
+        Take a token only if one is free and nobody is queued. Used for optional calls such as hedges.
+        """
+        with self._cond:
+            if self.rate > 0:
+                self._refill(time.monotonic())
+                if self._waiting or self._tokens < 1:
+                    return False
+                self._tokens -= 1
+            self.granted[priority] += 1
+        UPSTREAM_WAIT.observe(0.0, upstream=self.name, priority=PRIORITY_NAMES[priority])
+        return True
+
+    def throttle(self, seconds):
+        """
+        Empty the bucket and hold back every call for `seconds` (after a 429 from the upstream).
+        """
+        UPSTREAM_THROTTLED.inc(upstream=self.name)
+        with self._cond:
+            self.throttled += 1
+            if self.rate > 0:
+                now = time.monotonic()
+                self._refill(now)
+                self._tokens = min(self._tokens, 0.0)
+                # Tokens start accruing again once the pause is over
+                self._updated = max(self._updated, now + seconds)
+                self._cond.notify_all()
+
+    def queue_depths(self):
+        """
+        Number of queued calls per priority name.
+        """
+        with self._cond:
+            depths = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _ in self._waiting:
+                depths[PRIORITY_NAMES[priority]] += 1
+            return depths
+
+    def stats(self):
+        with self._cond:
+            self._refill(time.monotonic())
+            tokens = self._tokens
+            granted = {PRIORITY_NAMES[priority]: count for priority, count in self.granted.items()}
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": round(tokens, 2),
+            "queued": self.queue_depths(),
+            "granted": granted,
+            "throttled": self.throttled,
+        }
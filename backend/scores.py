@@ -0,0 +1,235 @@
+import sqlite3
+import threading
+import time
+
+# Points awarded per correct answer by `submit_test` in src/project.rs
+POINTS_PER_CORRECT_ANSWER = 4
+
+SORT_COLUMNS = {"score": "score", "num_tests": "num_tests", "student": "student", "submissions": "submissions"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    contract TEXT NOT NULL,
+    student TEXT NOT NULL,
+    score INTEGER NOT NULL DEFAULT 0,
+    num_tests INTEGER NOT NULL DEFAULT 0,
+    submissions INTEGER NOT NULL DEFAULT 0,
+    reconciled_at REAL,
+    PRIMARY KEY (contract, student)
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (contract, score);
+CREATE TABLE IF NOT EXISTS score_events (
+    tx_hash TEXT PRIMARY KEY
+);
+"""
+
+
+class ScoreBoard:
+    """
+    Per-contract score table kept up to date from observed transactions.
+
+    Every successful `generate_test` increments a student's test count and every
+    successful `submit_test` adds the contract's points for its correct answers.
+    Each transaction is applied once, whoever observes it first (the indexer or
+    the request that sent it). A background pass periodically reconciles the
+    scores with the contract's `test_results` view, which stays authoritative.
+
+    The view may already include a submission that is final on chain but not
+    observed yet; overwriting the score then would count it twice once it is
+    observed. Submissions are therefore registered when sent (`submitted`), and
+    a pass leaves the score of a student with unobserved submissions alone.
+
+    `num_tests` is contract storage without a view, so it is only ever counted
+    from observed transactions.
+    """
+
+    def __init__(self, db_path, query_score, reconcile_interval=60.0, map_fn=map, settle_timeout=300.0):
+        """
+        :param db_path: Path of the SQLite database (may be shared with the indexer).
+        :param query_score: Callable `(contract, student)` returning the on-chain score.
+        :param reconcile_interval: Seconds between reconciliation passes.
+        :param map_fn: `map`-like callable used to run the score queries of a pass concurrently.
+        :param settle_timeout: Seconds after which a submitted but never observed transaction is forgotten.
+        """
+        self.query_score = query_score
+        self.reconcile_interval = reconcile_interval
+        self.map_fn = map_fn
+        self.settle_timeout = settle_timeout
+
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+        self._lock = threading.Lock()
+
+        self._contracts = set()
+        self._unsettled = {}  # (contract, student) -> {tx_hash: deadline} of sent, unobserved submissions
+        self._thread = None
+        self._stop = threading.Event()
+
+        self.applied = 0
+        self.reconciliations = 0
+        self.corrections = 0
+        self.deferred = 0
+        self.errors = 0
+
+    def follow(self, contract):
+        """
+        Reconcile a contract's scores periodically (starting the background thread on first use).
+        """
+        with self._lock:
+            self._contracts.add(contract)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="scores", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.reconcile_interval):
+            with self._lock:
+                contracts = list(self._contracts)
+            for contract in contracts:
+                self.reconcile(contract)
+
+    def submitted(self, contract, student, tx_hash):
+        """
+        Register a sent `submit_test` transaction; the student is not reconciled until it is observed.
+        """
+        with self._lock:
+            self._unsettled.setdefault((contract, student), {})[tx_hash] = time.monotonic() + self.settle_timeout
+
+    def settled(self, contract, student, tx_hash):
+        """
+        Forget a registered submission without applying it (e.g. it failed on chain).
+        """
+        with self._lock:
+            self._settle(contract, student, tx_hash)
+
+    def _settle(self, contract, student, tx_hash):
+        pending = self._unsettled.get((contract, student))
+        if pending is not None:
+            pending.pop(tx_hash, None)
+            if not pending:
+                del self._unsettled[(contract, student)]
+
+    def _is_unsettled(self, contract, student, now):
+        pending = self._unsettled.get((contract, student))
+        if pending is None:
+            return False
+        for tx_hash, deadline in list(pending.items()):
+            if deadline <= now:
+                self._settle(contract, student, tx_hash)
+        return (contract, student) in self._unsettled
+
+    def observe(self, contract, function, student, tx_hash, record):
+        """
+        Apply a final transaction to the score table (once per tx hash).
+
+        :param record: Decoded transaction record (see `codec.decode_transaction`).
+        :return: True if the transaction changed the table.
+        """
+        with self._lock:
+            self._settle(contract, student, tx_hash)
+        if record.get("status") != "success":
+            return False
+        if function == "generate_test":
+            score_delta, tests_delta, submissions_delta = 0, 1, 0
+        elif function == "submit_test" and record.get("correct_answers") is not None:
+            score_delta, tests_delta, submissions_delta = POINTS_PER_CORRECT_ANSWER * record["correct_answers"], 0, 1
+        else:
+            return False
+
+        # The connection context commits (or rolls back) the transaction on every path
+        with self._lock, self._db:
+            if self._db.execute("INSERT OR IGNORE INTO score_events (tx_hash) VALUES (?)", (tx_hash,)).rowcount == 0:
+                return False
+            self._db.execute(
+                "INSERT INTO scores (contract, student, score, num_tests, submissions) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (contract, student) DO UPDATE SET "
+                "score = score + excluded.score, num_tests = num_tests + excluded.num_tests, submissions = submissions + excluded.submissions",
+                (contract, student, score_delta, tests_delta, submissions_delta),
+            )
+            self.applied += 1
+            return True
+
+    def reconcile(self, contract):
+        """
+        Overwrite the contract's stored scores with the values of its `test_results` view.
+        Students with unobserved submissions are deferred to a later pass.
+
+        :return: Number of corrected scores.
+        """
+        with self._lock:
+            rows = self._db.execute("SELECT student, score FROM scores WHERE contract = ?", (contract,)).fetchall()
+            now = time.monotonic()
+            settled_rows = [row for row in rows if not self._is_unsettled(contract, row[0], now)]
+            deferred = len(rows) - len(settled_rows)
+
+        def query(row):
+            try:
+                return row[0], row[1], self.query_score(contract, row[0])
+            except Exception:
+                return row[0], row[1], None
+
+        corrected = 0
+        now = time.time()
+        with_scores = list(self.map_fn(query, settled_rows))
+        with self._lock, self._db:
+            for student, stored, on_chain in with_scores:
+                if on_chain is None:
+                    self.errors += 1
+                    continue
+                # A submission sent during the pass may already be in the queried score
+                if self._is_unsettled(contract, student, time.monotonic()):
+                    deferred += 1
+                    continue
+                # A score that changed during the pass is left for the next one
+                updated = self._db.execute(
+                    "UPDATE scores SET score = ?, reconciled_at = ? WHERE contract = ? AND student = ? AND score = ?",
+                    (on_chain, now, contract, student, stored),
+                ).rowcount
+                if updated and on_chain != stored:
+                    corrected += 1
+            self.reconciliations += 1
+            self.corrections += corrected
+            self.deferred += deferred
+        return corrected
+
+    def page(self, contract, sort="score", descending=True, offset=0, limit=50):
+        """
+        Return one page of a contract's leaderboard.
+
+        :param sort: Column to sort by (`score`, `num_tests`, `submissions` or `student`).
+        :return: Tuple of (total number of students, list of student dicts with their rank).
+        """
+        column = SORT_COLUMNS.get(sort)
+        if column is None:
+            raise ValueError(f"Cannot sort by {sort!r}; use one of {', '.join(SORT_COLUMNS)}")
+        direction = "DESC" if descending else "ASC"
+
+        with self._lock:
+            total = self._db.execute("SELECT COUNT(*) FROM scores WHERE contract = ?", (contract,)).fetchone()[0]
+            rows = self._db.execute(
+                f"SELECT student, score, num_tests, submissions, reconciled_at, "
+                f"(SELECT COUNT(*) FROM scores AS better WHERE better.contract = scores.contract AND better.score > scores.score) + 1 "
+                f"FROM scores WHERE contract = ? ORDER BY {column} {direction}, student ASC LIMIT ? OFFSET ?",
+                (contract, limit, offset),
+            ).fetchall()
+
+        return total, [
+            {"student": student, "rank": rank, "score": score, "num_tests": num_tests, "submissions": submissions, "reconciled_at": reconciled_at}
+            for student, score, num_tests, submissions, reconciled_at, rank in rows
+        ]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "students": self._db.execute("SELECT COUNT(*) FROM scores").fetchone()[0],
+                "applied": self.applied,
+                "reconciliations": self.reconciliations,
+                "corrections": self.corrections,
+                "deferred": self.deferred,
+                "unsettled": sum(len(pending) for pending in self._unsettled.values()),
+                "errors": self.errors,
+            }
@@ -0,0 +1,117 @@
+import asyncio
+import threading
+
+from metrics import registry
+
+SINGLEFLIGHT_CALLS = registry.counter(
+    "singleflight_calls_total",
+    "Coalesced lookups by kind; role=leader made the upstream call, role=follower shared its result.",
+    ("kind", "role"),
+)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical calls into one.
+
+    The first caller for a key runs the function; callers arriving with the same
+    key while it runs wait for it and receive the same result (or exception).
+    Nothing is cached: once the call returns, the next caller starts a new one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def do(self, kind, key, fn):
+        """
+        Run `fn()` once for all concurrent callers of (`kind`, `key`) and return its result.
+
+        :param kind: Kind of lookup, used as the metric label (e.g. "transaction").
+        :param key: Identity of the lookup within its kind (e.g. a tx hash).
+        """
+        with self._lock:
+            call = self._calls.get((kind, key))
+            leader = call is None
+            if leader:
+                call = self._calls[(kind, key)] = _Call()
+                self.leaders += 1
+            else:
+                call.followers += 1
+                self.followers += 1
+        SINGLEFLIGHT_CALLS.inc(kind=kind, role="leader" if leader else "follower")
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[(kind, key)]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            total = self.leaders + self.followers
+            return {
+                "calls": total,
+                "upstream_calls": self.leaders,
+                "collapsed": self.followers,
+                "collapse_ratio": round(self.followers / total, 4) if total else 0.0,
+                "in_flight": len(self._calls),
+            }
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of `SingleFlight`: concurrent identical coroutines await one shared task.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.leaders = 0
+        self.followers = 0
+
+    async def do(self, kind, key, coroutine_fn):
+        """
+        Await `coroutine_fn()` once for all concurrent callers of (`kind`, `key`).
+        """
+        task = self._calls.get((kind, key))
+        if task is None:
+            task = self._calls[(kind, key)] = asyncio.ensure_future(coroutine_fn())
+            task.add_done_callback(lambda _: self._calls.pop((kind, key), None))
+            self.leaders += 1
+            SINGLEFLIGHT_CALLS.inc(kind=kind, role="leader")
+        else:
+            self.followers += 1
+            SINGLEFLIGHT_CALLS.inc(kind=kind, role="follower")
+        # A cancelled waiter must not cancel the shared call
+        return await asyncio.shield(task)
+
+    def stats(self):
+        total = self.leaders + self.followers
+        return {
+            "calls": total,
+            "upstream_calls": self.leaders,
+            "collapsed": self.followers,
+            "collapse_ratio": round(self.followers / total, 4) if total else 0.0,
+            "in_flight": len(self._calls),
+        }
@@ -0,0 +1,61 @@
+import threading
+import time
+
+from cache import TxResultCache
+
+
+def record(operations="1 + 1"):
+    return {"status": "success", "final": True, "operations": operations}
+
+
+def test_final_records_are_kept_and_pending_ones_expire():
+    cache = TxResultCache(pending_ttl=0.05)
+    cache.put("final", record(), final=True)
+    cache.put("pending", record(), final=False)
+    assert cache.get("pending") == record()
+
+    time.sleep(0.06)
+    assert cache.get("final") == record()
+    assert cache.get("pending") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_records_are_evicted():
+    size = len('{"status": "success", "final": true, "operations": "1 + 1"}')
+    cache = TxResultCache(max_bytes=2 * size)
+    cache.put("a", record(), final=True)
+    cache.put("b", record(), final=True)
+    cache.get("a")
+    cache.put("c", record(), final=True)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = TxResultCache(disk_path=path)
+    cache.put("final", record(), final=True)
+    cache.put("pending", record(), final=False)
+    cache.put("indexed", record(), final=True, persist=False)
+
+    restarted = TxResultCache(disk_path=path)
+    assert restarted.get("final") == record()
+    assert restarted.get("pending") is None
+    assert restarted.get("indexed") is None
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_memory_hits_do_not_wait_for_the_disk(tmp_path):
+    cache = TxResultCache(disk_path=tmp_path / "cache.sqlite3")
+    cache.put("hot", record(), final=True)
+    results = []
+
+    # Hold the disk tier as a long commit or read would
+    with cache._disk_lock:
+        reader = threading.Thread(target=lambda: results.append(cache.get("hot")))
+        reader.start()
+        reader.join(timeout=1)
+        assert results == [record()]
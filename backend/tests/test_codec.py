@@ -0,0 +1,85 @@
+"""
+Local grading against results worked out by hand from `solve_operation` and
+`submit_test` in `src/project.rs`.
+"""
+from codec import decode_answer, expected_answer, grade_answers, solve_operation
+
+
+def operation(operand1, operator, operand2):
+    return {"operand1": operand1, "operator": operator, "operand2": operand2, "operation": f"{operand1} {operator} {operand2}"}
+
+
+def correctness(feedback):
+    return [item["correct"] for item in feedback]
+
+
+def test_solve_operation_matches_contract_arithmetic():
+    assert solve_operation(4, "+", 5) == 9
+    assert solve_operation(9, "*", 9) == 81
+    assert solve_operation(3, "-", 7) == -4
+    # i8 division truncates toward zero
+    assert solve_operation(7, "/", 2) == 3
+    assert solve_operation(2, "/", 7) == 0
+    assert solve_operation(-7, "/", 2) == -3
+    assert solve_operation(7, "/", -2) == -3
+    # Division by zero and unknown operators yield 0
+    assert solve_operation(5, "/", 0) == 0
+    assert solve_operation(5, "%", 3) == 0
+
+
+def test_solve_operation_wraps_like_i8():
+    assert solve_operation(100, "+", 100) == -56
+    assert solve_operation(-100, "-", 100) == 56
+
+
+def test_decode_answer_reads_bytes_as_i8():
+    assert decode_answer(0) == 0
+    assert decode_answer(127) == 127
+    assert decode_answer(128) == -128
+    assert decode_answer(252) == -4
+
+
+def test_expected_answer_of_zero_first_operand_is_zero():
+    # The contract copies the operation up to its first zero byte, so "0 + 5" is solved as empty
+    assert expected_answer(0, "+", 5) == 0
+    assert expected_answer(0, "-", 3) == 0
+    assert expected_answer(0, "*", 7) == 0
+    assert expected_answer(5, "+", 0) == 5
+
+
+def test_grade_answers_all_correct():
+    operations = [operation(4, "+", 5), operation(9, "*", 9), operation(3, "-", 7), operation(7, "/", 2), operation(8, "/", 0)]
+    feedback = grade_answers(operations, [9, 81, -4, 3, 0])
+
+    assert feedback == [{"question": number, "correct": True, "feedback": "Correct"} for number in range(1, 6)]
+
+
+def test_grade_answers_zero_first_operand_quirk():
+    operations = [operation(0, "+", 5), operation(0, "+", 5), operation(0, "*", 0), operation(1, "+", 1), operation(0, "-", 2)]
+    feedback = grade_answers(operations, [5, 0, 0, 2, -2])
+
+    assert correctness(feedback) == [False, True, True, True, False]
+    assert [item["feedback"] for item in feedback] == ["Incorrect", "Correct", "Correct", "Correct", "Incorrect"]
+
+
+def test_grade_answers_negative_answers():
+    operations = [operation(1, "-", 9), operation(3, "-", 7), operation(2, "-", 3), operation(5, "-", 5), operation(6, "-", 8)]
+    # Negative answers may be sent as integers or as their two's complement byte
+    feedback = grade_answers(operations, [-8, 252, 1, 0, 254])
+
+    assert correctness(feedback) == [True, True, False, True, True]
+
+
+def test_grade_answers_truncating_division():
+    operations = [operation(7, "/", 2), operation(9, "/", 4), operation(1, "/", 2), operation(9, "/", 3), operation(7, "/", 2)]
+    # 7 / 2 is 3, not 3.5 rounded to 4
+    feedback = grade_answers(operations, [3, 2, 0, 3, 4])
+
+    assert correctness(feedback) == [True, True, True, True, False]
+
+
+def test_grade_answers_missing_answers_count_as_zero():
+    operations = [operation(2, "+", 2), operation(5, "-", 5), operation(0, "+", 1), operation(3, "*", 3), operation(1, "/", 3)]
+    feedback = grade_answers(operations, [4])
+
+    assert correctness(feedback) == [True, True, True, False, True]
@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+
+from nonces import NonceManager, is_nonce_error
+
+
+class FakeAddress:
+    def __init__(self, bech32):
+        self.bech32 = bech32
+
+    def to_bech32(self):
+        return self.bech32
+
+
+class FakeGateway:
+    def __init__(self, nonces):
+        self.nonces = nonces
+        self.reads = 0
+
+    def get_account_nonce(self, address):
+        self.reads += 1
+        return self.nonces[address.to_bech32()]
+
+
+@pytest.fixture
+def alice():
+    return FakeAddress("erd1alice")
+
+
+def test_nonces_are_seeded_once_then_counted_locally(alice):
+    gateway = FakeGateway({"erd1alice": 7})
+    manager = NonceManager(gateway.get_account_nonce)
+
+    assert [manager.next_nonce(alice) for _ in range(3)] == [7, 8, 9]
+    assert manager.next_nonces(alice, 2) == [10, 11]
+    assert gateway.reads == 1
+
+
+def test_release_returns_the_latest_nonce_only(alice):
+    manager = NonceManager(FakeGateway({"erd1alice": 0}).get_account_nonce)
+    first, second = manager.next_nonce(alice), manager.next_nonce(alice)
+
+    # An older nonce cannot be handed back without reusing a later one
+    assert manager.release(alice, first) is False
+    assert manager.release(alice, second) is True
+    assert manager.next_nonce(alice) == second
+
+
+def test_release_of_unseeded_sender_is_refused(alice):
+    manager = NonceManager(FakeGateway({}).get_account_nonce)
+
+    assert manager.release(alice, 0) is False
+    assert not manager.is_seeded(alice)
+
+
+def test_resync_reads_the_nonce_again(alice):
+    gateway = FakeGateway({"erd1alice": 3})
+    manager = NonceManager(gateway.get_account_nonce)
+    assert manager.next_nonce(alice) == 3
+    assert manager.next_nonce(alice) == 4
+
+    # The transaction with nonce 4 was dropped: the chain still expects 4
+    gateway.nonces["erd1alice"] = 4
+    manager.resync(alice)
+
+    assert not manager.is_seeded(alice)
+    assert manager.next_nonce(alice) == 4
+    assert gateway.reads == 2
+    assert manager.stats() == {"senders": 1, "seeds": 2, "resyncs": 1}
+
+
+def test_seed_keeps_an_existing_nonce(alice):
+    manager = NonceManager(fetch_nonce=None)
+    manager.seed(alice, 5)
+    manager.seed(alice, 9)
+
+    assert manager.next_nonce(alice) == 5
+
+
+def test_send_releases_the_nonce_of_a_failed_send(alice):
+    gateway = FakeGateway({"erd1alice": 0})
+    manager = NonceManager(gateway.get_account_nonce)
+    attempts = []
+
+    def refuse(nonce):
+        attempts.append(nonce)
+        raise RuntimeError("transaction generation failed: insufficient balance")
+
+    with pytest.raises(RuntimeError):
+        manager.send(alice, refuse)
+    # Not a nonce error: no resync, no second attempt, and the nonce is reused
+    assert attempts == [0]
+    assert manager.send(alice, lambda nonce: nonce) == 0
+    assert gateway.reads == 1
+    assert manager.stats()["resyncs"] == 0
+
+
+def test_send_retries_once_after_a_nonce_error(alice):
+    gateway = FakeGateway({"erd1alice": 0})
+    manager = NonceManager(gateway.get_account_nonce)
+    manager.next_nonce(alice)  # reserved locally, but the chain moved on
+    gateway.nonces["erd1alice"] = 2
+    attempts = []
+
+    def send(nonce):
+        attempts.append(nonce)
+        if nonce != 2:
+            raise RuntimeError("transaction generation failed: lowerNonceInTx: true")
+        return "hash"
+
+    assert manager.send(alice, send) == "hash"
+    assert attempts == [1, 2]
+    assert manager.next_nonce(alice) == 3
+
+
+def test_is_nonce_error():
+    assert is_nonce_error(RuntimeError("transaction generation failed: lowerNonceInTx: true"))
+    assert is_nonce_error(RuntimeError("transaction generation failed: duplicated nonce (tx already in pool)"))
+    assert not is_nonce_error(RuntimeError("transaction generation failed: insufficient balance"))
+    assert not is_nonce_error(RuntimeError("transaction generation failed: invalid signature"))
+
+
+def test_send_async_seeds_with_an_awaited_read_and_retries(alice):
+    gateway = FakeGateway({"erd1alice": 4})
+    manager = NonceManager(fetch_nonce=None)
+    attempts = []
+
+    async def fetch_nonce(address):
+        return gateway.get_account_nonce(address)
+
+    async def send(nonce):
+        attempts.append(nonce)
+        if nonce == 4:
+            gateway.nonces["erd1alice"] = 6
+            raise RuntimeError("transaction generation failed: lowerNonceInTx: true")
+        return "hash"
+
+    assert asyncio.run(manager.send_async(alice, fetch_nonce, send)) == "hash"
+    assert attempts == [4, 6]
+    assert gateway.reads == 2
+
+
+def test_send_async_releases_the_nonce_of_a_failed_send(alice):
+    gateway = FakeGateway({"erd1alice": 0})
+    manager = NonceManager(fetch_nonce=None)
+
+    async def fetch_nonce(address):
+        return gateway.get_account_nonce(address)
+
+    async def refuse(nonce):
+        raise RuntimeError("transaction generation failed: invalid signature")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(manager.send_async(alice, fetch_nonce, refuse))
+    assert manager.next_nonce(alice) == 0
+    assert gateway.reads == 1
@@ -0,0 +1,124 @@
+import threading
+import time
+
+import pytest
+
+from gateway import GatewayClient
+from mock_gateway import MockChain, MockGateway
+from scheduler import BULK, CONFIRM, READ, SEND, UpstreamScheduler
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.001)
+
+
+def test_queued_calls_are_served_by_priority_then_arrival():
+    # One token every 50 ms, none left: every caller below has to queue
+    scheduler = UpstreamScheduler("test", rate=20.0, burst=1.0)
+    scheduler.acquire(READ)
+    served = []
+    threads = []
+
+    def call(name, priority):
+        scheduler.acquire(priority)
+        served.append(name)
+
+    for queued, (name, priority) in enumerate([("bulk", BULK), ("read", READ), ("confirm", CONFIRM), ("bulk2", BULK), ("send", SEND)], start=1):
+        thread = threading.Thread(target=call, args=(name, priority))
+        thread.start()
+        threads.append(thread)
+        wait_until(lambda: sum(scheduler.queue_depths().values()) + len(served) == queued)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    # The first bulk call may have taken the first token before the others queued
+    if served[0] == "bulk":
+        assert served == ["bulk", "send", "confirm", "read", "bulk2"]
+    else:
+        assert served == ["send", "confirm", "read", "bulk", "bulk2"]
+    assert scheduler.stats()["granted"] == {"send": 1, "confirm": 1, "read": 2, "bulk": 2}
+
+
+def test_rate_limits_calls():
+    scheduler = UpstreamScheduler("test", rate=50.0, burst=1.0)
+    started = time.monotonic()
+    for _ in range(6):
+        scheduler.acquire()
+
+    # The first call uses the burst; the other five wait 20 ms each
+    assert time.monotonic() - started >= 0.09
+
+
+def test_try_acquire_never_jumps_the_queue():
+    scheduler = UpstreamScheduler("test", rate=10.0, burst=1.0)
+    assert scheduler.try_acquire(READ)
+    assert not scheduler.try_acquire(READ)
+
+    waiter = threading.Thread(target=scheduler.acquire, args=(BULK,))
+    waiter.start()
+    wait_until(lambda: scheduler.queue_depths()["bulk"] == 1)
+    time.sleep(0.12)  # a token is due, but it belongs to the queued call
+    assert not scheduler.try_acquire(SEND)
+    waiter.join(timeout=5)
+
+
+def test_throttle_pauses_the_bucket():
+    scheduler = UpstreamScheduler("test", rate=1000.0, burst=5.0)
+    scheduler.throttle(0.1)
+    started = time.monotonic()
+    scheduler.acquire(SEND)
+
+    assert time.monotonic() - started >= 0.09
+    assert scheduler.stats()["throttled"] == 1
+
+
+def test_unlimited_scheduler_only_counts():
+    scheduler = UpstreamScheduler("test")
+    for _ in range(100):
+        assert scheduler.acquire(BULK) < 0.01
+    assert scheduler.try_acquire(SEND)
+    assert scheduler.stats()["granted"]["bulk"] == 100
+
+
+def test_priority_context_and_bind():
+    scheduler = UpstreamScheduler("test")
+    assert scheduler.current_priority() == READ
+    with scheduler.priority(BULK):
+        assert scheduler.current_priority() == BULK
+        assert scheduler.bind(SEND, scheduler.current_priority)() == SEND
+        assert scheduler.current_priority() == BULK
+    assert scheduler.current_priority(default=CONFIRM) == CONFIRM
+
+
+class RecordingScheduler(UpstreamScheduler):
+    def __init__(self):
+        super().__init__("test")
+        self.acquired_in = []
+
+    def acquire(self, priority=READ):
+        self.acquired_in.append(threading.current_thread())
+        return super().acquire(priority)
+
+
+@pytest.fixture
+def gateways():
+    chain = MockChain(seed=1)
+    nodes = [MockGateway(chain=chain, latency=0.0) for _ in range(2)]
+    yield [node.start() for node in nodes]
+    for node in nodes:
+        node.shutdown()
+
+
+def test_hedged_reads_queue_for_tokens_in_the_calling_thread(gateways):
+    # The hedge executor serves its queue first come, first served; the priority
+    # order only holds if the caller waits for the token before handing the call over
+    scheduler = RecordingScheduler()
+    client = GatewayClient(gateways, scheduler=scheduler)
+    with scheduler.priority(BULK):
+        client.get("address/erd1alice")
+
+    assert scheduler.acquired_in == [threading.current_thread()]
+    assert scheduler.stats()["granted"]["bulk"] == 1
@@ -0,0 +1,97 @@
+import pytest
+
+from scores import POINTS_PER_CORRECT_ANSWER, ScoreBoard
+
+CONTRACT = "erd1contract"
+
+
+class FakeContract:
+    def __init__(self):
+        self.scores = {}
+
+    def query_score(self, contract, student):
+        return self.scores.get(student, 0)
+
+
+def submission(correct_answers):
+    return {"status": "success", "correct_answers": correct_answers}
+
+
+@pytest.fixture
+def contract():
+    return FakeContract()
+
+
+@pytest.fixture
+def board(tmp_path, contract):
+    return ScoreBoard(tmp_path / "scores.sqlite3", contract.query_score)
+
+
+def score_of(board, student):
+    _, students = board.page(CONTRACT)
+    return {row["student"]: row["score"] for row in students}[student]
+
+
+def test_each_transaction_is_applied_once(board):
+    assert board.observe(CONTRACT, "generate_test", "alice", "gen1", {"status": "success"})
+    assert board.observe(CONTRACT, "submit_test", "alice", "sub1", submission(3))
+    assert not board.observe(CONTRACT, "submit_test", "alice", "sub1", submission(3))
+    assert not board.observe(CONTRACT, "submit_test", "alice", "sub2", {"status": "fail", "correct_answers": None})
+
+    _, students = board.page(CONTRACT)
+    assert students == [{"student": "alice", "rank": 1, "score": 3 * POINTS_PER_CORRECT_ANSWER, "num_tests": 1, "submissions": 1, "reconciled_at": None}]
+
+
+def test_reconcile_corrects_settled_scores(board, contract):
+    board.observe(CONTRACT, "submit_test", "alice", "sub1", submission(2))
+    contract.scores["alice"] = 20
+
+    assert board.reconcile(CONTRACT) == 1
+    assert score_of(board, "alice") == 20
+
+
+def test_final_but_unobserved_submission_is_not_counted_twice(board, contract):
+    board.observe(CONTRACT, "submit_test", "alice", "sub1", submission(2))
+    contract.scores["alice"] = 8
+
+    # sub2 is final on chain (the view includes it) but not observed yet
+    board.submitted(CONTRACT, "alice", "sub2")
+    contract.scores["alice"] = 8 + 5 * POINTS_PER_CORRECT_ANSWER
+    assert board.reconcile(CONTRACT) == 0
+    assert score_of(board, "alice") == 8
+
+    board.observe(CONTRACT, "submit_test", "alice", "sub2", submission(5))
+    assert score_of(board, "alice") == 28
+    board.reconcile(CONTRACT)
+    assert score_of(board, "alice") == 28
+    assert board.stats()["deferred"] == 1
+
+
+def test_submission_sent_during_a_pass_defers_the_student(tmp_path, contract):
+    def query_score(contract_address, student):
+        # The submission is sent, and executed, while the pass is querying
+        board.submitted(CONTRACT, student, "sub2")
+        return 5 * POINTS_PER_CORRECT_ANSWER
+
+    board = ScoreBoard(tmp_path / "scores.sqlite3", query_score)
+    board.observe(CONTRACT, "generate_test", "alice", "gen1", {"status": "success"})
+
+    board.reconcile(CONTRACT)
+    board.observe(CONTRACT, "submit_test", "alice", "sub2", submission(5))
+    assert score_of(board, "alice") == 5 * POINTS_PER_CORRECT_ANSWER
+
+
+def test_failed_or_expired_submissions_stop_deferring(tmp_path, contract):
+    board = ScoreBoard(tmp_path / "scores.sqlite3", contract.query_score, settle_timeout=0.0)
+    board.observe(CONTRACT, "generate_test", "alice", "gen1", {"status": "success"})
+    contract.scores["alice"] = 12
+
+    board.submitted(CONTRACT, "alice", "lost")
+    assert board.reconcile(CONTRACT) == 1
+
+    board.settle_timeout = 300.0
+    board.submitted(CONTRACT, "alice", "failed")
+    board.settled(CONTRACT, "alice", "failed")
+    contract.scores["alice"] = 16
+    assert board.reconcile(CONTRACT) == 1
+    assert board.stats()["unsettled"] == 0
@@ -1,11 +1,373 @@
 import sys
+import threading
 import requests
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool, Qt, pyqtSignal
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QVBoxLayout, QPushButton, QLabel, QLineEdit, QWidget, QFileDialog, QTextEdit, QMessageBox, QHBoxLayout
+    QApplication, QMainWindow, QVBoxLayout, QPushButton, QLabel, QLineEdit, QWidget, QFileDialog, QTextEdit, QMessageBox, QHBoxLayout,
+    QProgressBar, QTableView, QHeaderView
 )
-import time
 
 API_BASE_URL = "http://127.0.0.1:5003"
+MAX_WORKERS = 8
+JOB_POLL_INTERVAL = 1.0  # seconds between /jobs/<id> polls
+REQUEST_TIMEOUT = 30
+DASHBOARD_PAGE_SIZE = 200  # students per /leaderboard page
+
+# Keep-alive connections to the backend, shared by all workers
+http = requests.Session()
+
+
+class CancelledError(Exception):
+    pass
+
+
+class WorkerSignals(QObject):
+    progress = pyqtSignal(str)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class Worker(QRunnable):
+    """
+    Runs a backend call on the thread pool and reports back to the GUI thread through signals.
+    The task function receives the worker, so it can report progress and check for cancellation.
+    """
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = WorkerSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise CancelledError()
+
+    def sleep(self, seconds):
+        # Returns early when the worker is cancelled
+        if self._cancelled.wait(seconds):
+            raise CancelledError()
+
+    def run(self):
+        try:
+            result = self.fn(self, *self.args)
+        except CancelledError:
+            return
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(str(e))
+            return
+        if not self.cancelled:
+            self.signals.finished.emit(result)
+
+
+def wait_for_job(worker, job):
+    """
+    Poll a backend job until it finishes and return its result.
+    """
+    job_id = job["job_id"]
+    while True:
+        worker.check_cancelled()
+        response = http.get(f"{API_BASE_URL}/jobs/{job_id}", timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        state = response.json()
+        if state["status"] == "succeeded":
+            return state["result"]
+        if state["status"] == "failed":
+            raise Exception(state.get("error") or "Job failed")
+        worker.signals.progress.emit(f"Waiting for transaction {state.get('tx_hash')} ({state['status']})")
+        worker.sleep(JOB_POLL_INTERVAL)
+
+
+def fetch_leaderboard_page(worker, contract_address, sort, descending, page):
+    response = http.get(f"{API_BASE_URL}/leaderboard", params={
+        "contract_address": contract_address,
+        "sort": sort,
+        "order": "desc" if descending else "asc",
+        "page": page,
+        "page_size": DASHBOARD_PAGE_SIZE,
+        "with_tests": 1,
+    }, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+class DashboardModel(QAbstractTableModel):
+    """
+    Table of a contract's students, loaded page by page from the backend as the view scrolls.
+
+    Pages come from `/leaderboard` (which also sorts the score columns), together with
+    the latest test of every student (operations and per-question correctness).
+    Filtering only changes which loaded rows are shown.
+    """
+
+    # (row key, header)
+    COLUMNS = [
+        ("rank", "Rank"),
+        ("student", "Student"),
+        ("score", "Score"),
+        ("num_tests", "Tests"),
+        ("submissions", "Submissions"),
+        ("test_number", "Latest test"),
+        ("operations", "Operations"),
+        ("questions", "Per question"),
+        ("correct_answers", "Correct"),
+    ]
+    # Columns the backend can sort by; the others are sorted among the loaded rows
+    SERVER_SORT = {"rank": "score", "student": "student", "score": "score", "num_tests": "num_tests", "submissions": "submissions"}
+    NUMERIC = {"rank", "score", "num_tests", "submissions", "test_number", "correct_answers"}
+
+    loading_changed = pyqtSignal(str)
+
+    def __init__(self, thread_pool, contract_address=None):
+        super().__init__()
+        self.thread_pool = thread_pool
+        self.contract_address = contract_address
+        self._rows = []  # every loaded student
+        self._visible = []  # loaded students matching the filter, in display order
+        self._total = None
+        self._next_page = 1
+        self._loading = False
+        self._generation = 0  # results of older loads are dropped
+        self._workers = set()
+        self._filter = ""
+        self._sort = "score"
+        self._descending = True
+        self._local_sort = None  # (key, descending) for columns sorted among the loaded rows
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._visible)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][1]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._visible[index.row()]
+        key = self.COLUMNS[index.column()][0]
+
+        if role == Qt.DisplayRole:
+            if key == "operations":
+                return ", ".join(op["operation"] for op in row["operations"]) if row.get("operations") else ""
+            if key == "questions":
+                return self._questions(row)
+            if key == "correct_answers" and row.get("operations") and row.get("correct_answers") is None:
+                return "pending"
+            value = row.get(key)
+            return "" if value is None else str(value)
+        if role == Qt.ToolTipRole and key in ("operations", "questions") and row.get("operations"):
+            wrong = set(row.get("wrong_questions") or [])
+            submitted = row.get("correct_answers") is not None
+            return "\n".join(
+                f"{number}. {op['operation']}" + ((" - wrong" if number in wrong else " - correct") if submitted else "")
+                for number, op in enumerate(row["operations"], start=1)
+            )
+        if role == Qt.TextAlignmentRole and key in self.NUMERIC:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    @staticmethod
+    def _questions(row):
+        if not row.get("operations") or row.get("correct_answers") is None:
+            return ""
+        wrong = set(row.get("wrong_questions") or [])
+        return " ".join("\u2717" if number in wrong else "\u2713" for number in range(1, len(row["operations"]) + 1))
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._loading or not self.contract_address:
+            return False
+        return self._total is None or len(self._rows) < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._loading = True
+        self._start(fetch_leaderboard_page, self._on_page, self.contract_address, self._sort, self._descending, self._next_page)
+        self.loading_changed.emit(self.status())
+
+    def _start(self, fn, on_success, *args):
+        generation = self._generation
+        worker = Worker(fn, *args)
+        worker.signals.finished.connect(lambda result: self._finished(worker, generation, on_success, result))
+        worker.signals.failed.connect(lambda message: self._failed(worker, generation, message))
+        self._workers.add(worker)
+        self.thread_pool.start(worker)
+
+    def _finished(self, worker, generation, on_success, result):
+        self._workers.discard(worker)
+        if generation == self._generation:
+            on_success(result)
+
+    def _failed(self, worker, generation, message):
+        self._workers.discard(worker)
+        if generation == self._generation:
+            self._loading = False
+            self.loading_changed.emit(f"Loading failed: {message}")
+
+    def _on_page(self, page):
+        self._loading = False
+        self._total = page["total"]
+        self._next_page += 1
+        students = page["students"]
+        for row in students:
+            test = row.pop("latest_test", None)
+            if test is not None:
+                row["test_number"] = test["test_number"]
+                row["operations"] = test["operations"]
+                row["correct_answers"] = test["correct_answers"]
+                row["wrong_questions"] = test["wrong_questions"]
+        if not students:
+            # The table shrank while paging; stop here
+            self._total = len(self._rows)
+        self._rows.extend(students)
+
+        if self._local_sort is not None:
+            self._apply_view(layout_only=True)
+        else:
+            matching = [row for row in students if self._matches(row)]
+            if matching:
+                self.beginInsertRows(QModelIndex(), len(self._visible), len(self._visible) + len(matching) - 1)
+                self._visible.extend(matching)
+                self.endInsertRows()
+        self.loading_changed.emit(self.status())
+
+    def _matches(self, row):
+        return not self._filter or self._filter in row["student"].lower()
+
+    def _apply_view(self, layout_only=False):
+        """
+        Recompute the shown rows from the loaded ones (filter, then local sort).
+        """
+        visible = [row for row in self._rows if self._matches(row)]
+        if self._local_sort is not None:
+            key, descending = self._local_sort
+            # Rows without a value go last in both directions
+            present = [row for row in visible if row.get(key) is not None]
+            present.sort(key=lambda row: row[key], reverse=descending)
+            visible = present + [row for row in visible if row.get(key) is None]
+
+        if layout_only and len(visible) == len(self._visible):
+            self.layoutAboutToBeChanged.emit()
+            self._visible = visible
+            self.layoutChanged.emit()
+        else:
+            self.beginResetModel()
+            self._visible = visible
+            self.endResetModel()
+
+    def set_filter(self, text):
+        """
+        Show only the loaded students whose address contains `text`.
+        """
+        self._filter = text.strip().lower()
+        self._apply_view()
+        self.loading_changed.emit(self.status())
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        key = self.COLUMNS[column][0]
+        # Rank 1 is the best score
+        descending = order == Qt.DescendingOrder if key != "rank" else order == Qt.AscendingOrder
+        server_sort = self.SERVER_SORT.get(key)
+        if server_sort is None:
+            # Tests are compared by their result
+            self._local_sort = ("correct_answers" if key in ("operations", "questions") else key, descending)
+            self._apply_view(layout_only=True)
+            return
+        if self._local_sort is None and (server_sort, descending) == (self._sort, self._descending):
+            return
+        self._local_sort = None
+        self._sort, self._descending = server_sort, descending
+        self.reload()
+
+    def reload(self, contract_address=None):
+        """
+        Drop the loaded rows and start loading from the first page again.
+        """
+        if contract_address is not None:
+            self.contract_address = contract_address
+        self._generation += 1
+        for worker in self._workers:
+            worker.cancel()
+        self._workers.clear()
+        self.beginResetModel()
+        self._rows = []
+        self._visible = []
+        self._total = None
+        self._next_page = 1
+        self._loading = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def status(self):
+        if not self.contract_address:
+            return "No contract configured"
+        loaded = f"{len(self._rows)} of {self._total if self._total is not None else '?'} students loaded"
+        if self._filter:
+            loaded += f", {len(self._visible)} shown"
+        return loaded + (" (loading...)" if self._loading else "")
+
+
+class DashboardWindow(QWidget):
+    """
+    Teacher view of every student of the configured contract.
+    """
+
+    def __init__(self, thread_pool, contract_address):
+        super().__init__()
+        self.setWindowTitle("Teacher Dashboard")
+        self.setGeometry(150, 150, 1100, 700)
+
+        self.model = DashboardModel(thread_pool, contract_address)
+
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter by student address")
+        self.filter_input.textChanged.connect(self.model.set_filter)
+        self.refresh_button = QPushButton("Refresh")
+        self.refresh_button.clicked.connect(lambda: self.model.reload())
+        self.status_label = QLabel(self.model.status())
+        self.model.loading_changed.connect(self.status_label.setText)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setAlternatingRowColors(True)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setWordWrap(False)
+        # Fixed row heights keep scrolling cheap with thousands of rows
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setColumnWidth(1, 420)
+        self.table.setColumnWidth(6, 220)
+        self.table.horizontalHeader().setSortIndicator(2, Qt.DescendingOrder)
+        self.table.setSortingEnabled(True)
+
+        controls = QHBoxLayout()
+        controls.addWidget(self.filter_input)
+        controls.addWidget(self.refresh_button)
+        layout = QVBoxLayout()
+        layout.addLayout(controls)
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+
+    def set_contract(self, contract_address):
+        self.model.reload(contract_address)
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -16,6 +378,8 @@ class MainWindow(QMainWindow):
 
         self.contract_address = None
         self.wallet_pem = None
+        # Returned by /set_config; every transaction request names this configuration
+        self.wallet_address = None
 
         self.main_layout = QVBoxLayout()
 
@@ -56,9 +420,28 @@ class MainWindow(QMainWindow):
         self.get_test_results_button = QPushButton("Get Current Final Score")
         self.get_test_results_button.clicked.connect(self.get_test_results)
 
+        self.dashboard_button = QPushButton("Open Teacher Dashboard")
+        self.dashboard_button.clicked.connect(self.open_dashboard)
+        self.dashboard = None
+
         self.log_output = QTextEdit()
         self.log_output.setReadOnly(True)
 
+        self.progress_label = QLabel("Idle")
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_tasks)
+        progress_layout = QHBoxLayout()
+        progress_layout.addWidget(self.progress_label)
+        progress_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.cancel_button)
+
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(MAX_WORKERS)
+        self.active_workers = set()
+
         self.main_layout.addWidget(self.contract_label)
         self.main_layout.addWidget(self.contract_input)
         self.main_layout.addWidget(self.wallet_label)
@@ -74,6 +457,8 @@ class MainWindow(QMainWindow):
         self.main_layout.addWidget(self.get_operations_button)
         self.main_layout.addWidget(self.get_correct_answers_button)
         self.main_layout.addWidget(self.get_test_results_button)
+        self.main_layout.addWidget(self.dashboard_button)
+        self.main_layout.addLayout(progress_layout)
         self.main_layout.addWidget(self.log_output)
 
         container = QWidget()
@@ -83,6 +468,44 @@ class MainWindow(QMainWindow):
     def log_message(self, message):
         self.log_output.append(message)
 
+    def run_task(self, description, fn, on_success, *args):
+        """
+        Run `fn(worker, *args)` on the thread pool and call `on_success(result)` on the GUI thread.
+        """
+        worker = Worker(fn, *args)
+        worker.signals.progress.connect(self.progress_label.setText)
+        worker.signals.finished.connect(on_success)
+        worker.signals.failed.connect(lambda message: QMessageBox.critical(self, "Error", message))
+        worker.signals.finished.connect(lambda _: self.task_done(worker))
+        worker.signals.failed.connect(lambda _: self.task_done(worker))
+
+        self.active_workers.add(worker)
+        self.update_progress()
+        self.progress_label.setText(f"{description}...")
+        self.thread_pool.start(worker)
+
+    def task_done(self, worker):
+        self.active_workers.discard(worker)
+        self.update_progress()
+
+    def cancel_tasks(self):
+        # In-flight HTTP calls are abandoned; their results are ignored
+        for worker in self.active_workers:
+            worker.cancel()
+        self.active_workers.clear()
+        self.log_message("Cancelled running requests.")
+        self.update_progress()
+
+    def update_progress(self):
+        busy = bool(self.active_workers)
+        # A (0, 0) range shows a busy indicator
+        self.progress_bar.setRange(0, 0 if busy else 1)
+        self.cancel_button.setEnabled(busy)
+        if busy:
+            self.progress_label.setText(f"{len(self.active_workers)} request(s) running")
+        else:
+            self.progress_label.setText("Idle")
+
     def upload_pem_file(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Select Wallet PEM File", "", "PEM Files (*.pem)")
         if file_path:
@@ -96,76 +519,109 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Error", "Please provide a contract address and upload a wallet PEM file.")
             return
 
-        try:
-            response = requests.post(f"{API_BASE_URL}/set_config", json={
-                "contract_address": self.contract_address,
-                "wallet_pem": self.wallet_pem
-            })
-            response.raise_for_status()
-            self.log_message("Configuration set successfully.")
-            self.generate_test_button.setEnabled(True)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+        self.run_task("Setting configuration", self.set_config_task, self.on_config_set, self.contract_address, self.wallet_pem)
+
+    def set_config_task(self, worker, contract_address, wallet_pem):
+        response = http.post(f"{API_BASE_URL}/set_config", json={
+            "contract_address": contract_address,
+            "wallet_pem": wallet_pem
+        }, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+    def on_config_set(self, result):
+        self.wallet_address = result.get("wallet_address")
+        self.log_message(f"Configuration set successfully (wallet {self.wallet_address}).")
+        self.generate_test_button.setEnabled(True)
 
     def generate_test(self):
         sender_address = self.sender_input.text().strip()
         if not sender_address:
             QMessageBox.critical(self, "Error", "Please provide a sender address.")
             return
+        if not self.wallet_address:
+            QMessageBox.critical(self, "Error", "Please set the configuration first.")
+            return
 
-        try:
-            response = requests.post(f"{API_BASE_URL}/generate_and_get_operations", json={"sender_address": sender_address})
-            time.sleep(30)
-            response.raise_for_status()
-            operations = response.json().get("operations", [])
-            tx_hash = response.json().get("tx_hash")
-            self.tx_hash_input.setText(tx_hash)
-            self.log_message("Test generated successfully:")
-            for op in operations:
-                self.log_message(f"-> {op['operation']}")
-            self.submit_test_button.setEnabled(True)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+        self.run_task("Generating test", self.generate_test_task, self.on_test_generated, self.contract_address, self.wallet_address, sender_address)
+
+    def generate_test_task(self, worker, contract_address, wallet_address, sender_address):
+        # The backend returns as soon as the transaction is sent; confirmation is polled as a job
+        response = http.post(f"{API_BASE_URL}/generate_and_get_operations", json={
+            "contract_address": contract_address,
+            "wallet_address": wallet_address,
+            "sender_address": sender_address,
+            "async": True
+        }, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        job = response.json()
+        worker.signals.progress.emit(f"Test transaction sent: {job['tx_hash']}")
+        return wait_for_job(worker, job)
+
+    def on_test_generated(self, result):
+        operations = result.get("operations", [])
+        tx_hash = result.get("tx_hash")
+        self.tx_hash_input.setText(tx_hash)
+        self.log_message("Test generated successfully:")
+        for op in operations:
+            self.log_message(f"-> {op['operation']}")
+        self.submit_test_button.setEnabled(True)
 
     def submit_test(self):
         sender_address = self.sender_input.text().strip()
         if not sender_address:
             QMessageBox.critical(self, "Error", "Please provide a sender address.")
             return
+        if not self.wallet_address:
+            QMessageBox.critical(self, "Error", "Please set the configuration first.")
+            return
 
-        try:
-            # Collect answers from the input fields
-            answers = []
-            for input_field in self.answer_inputs:
-                value = input_field.text().strip()
-                if not value:
-                    QMessageBox.critical(self, "Error", "All answer fields must be filled.")
-                    return
-                try:
-                    answers.append(int(value))
-                except ValueError:
-                    QMessageBox.critical(self, "Error", "All answers must be integers.")
-                    return
-
-            # Ensure exactly 5 answers
-            if len(answers) != 5:
-                QMessageBox.critical(self, "Error", "Please provide exactly 5 answers.")
+        # Collect answers from the input fields
+        answers = []
+        for input_field in self.answer_inputs:
+            value = input_field.text().strip()
+            if not value:
+                QMessageBox.critical(self, "Error", "All answer fields must be filled.")
+                return
+            try:
+                answers.append(int(value))
+            except ValueError:
+                QMessageBox.critical(self, "Error", "All answers must be integers.")
                 return
 
-            # Make the API call
-            response = requests.post(f"{API_BASE_URL}/submit_test", json={
-                "sender_address": sender_address,
-                "answers": answers
-            })
-            time.sleep(30)  # Wait for the transaction to process
-            response.raise_for_status()
-            result = response.json()
-            tx_hash = result.get("tx_hash")
-            self.tx_hash_input.setText(tx_hash)
-            self.log_message(f"Test submitted: {result.get('correct_answers', 'No result')} correct answers.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+        # Ensure exactly 5 answers
+        if len(answers) != 5:
+            QMessageBox.critical(self, "Error", "Please provide exactly 5 answers.")
+            return
 
+        self.run_task("Submitting test", self.submit_test_task, self.on_test_submitted, self.contract_address, self.wallet_address, sender_address, answers)
+
+    def submit_test_task(self, worker, contract_address, wallet_address, sender_address, answers):
+        # The backend returns as soon as the transaction is sent (with a locally graded
+        # provisional result); confirmation is polled as a job
+        response = http.post(f"{API_BASE_URL}/submit_test", json={
+            "contract_address": contract_address,
+            "wallet_address": wallet_address,
+            "sender_address": sender_address,
+            "answers": answers,
+            "async": True,
+            "provisional": True
+        }, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        job = response.json()
+        provisional = job.get("provisional")
+        if provisional:
+            worker.signals.progress.emit(f"Provisional result: {provisional['correct_answers']} (confirming on chain...)")
+        else:
+            worker.signals.progress.emit(f"Answers sent: {job['tx_hash']}")
+        return wait_for_job(worker, job)
+
+    def on_test_submitted(self, result):
+        tx_hash = result.get("tx_hash")
+        self.tx_hash_input.setText(tx_hash)
+        self.log_message(f"Test submitted: {result.get('correct_answers', 'No result')} correct answers.")
+        if result.get("provisional_mismatch"):
+            self.log_message(f"Warning: the provisional result differed on questions {result.get('mismatched_questions')}.")
 
     def get_operations(self):
         tx_hash = self.tx_hash_input.text().strip()
@@ -173,15 +629,17 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Error", "Please provide a transaction hash.")
             return
 
-        try:
-            response = requests.get(f"{API_BASE_URL}/get_operations", params={"tx_hash": tx_hash})
-            response.raise_for_status()
-            operations = response.json().get("operations", [])
-            self.log_message("Operations fetched successfully:")
-            for op in operations:
-                self.log_message(f"-> {op['operation']}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+        self.run_task("Fetching operations", self.get_operations_task, self.on_operations_fetched, tx_hash)
+
+    def get_operations_task(self, worker, tx_hash):
+        response = http.get(f"{API_BASE_URL}/get_operations", params={"tx_hash": tx_hash}, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.json().get("operations", [])
+
+    def on_operations_fetched(self, operations):
+        self.log_message("Operations fetched successfully:")
+        for op in operations:
+            self.log_message(f"-> {op['operation']}")
 
     def get_correct_answers(self):
         tx_hash = self.tx_hash_input.text().strip()
@@ -189,13 +647,15 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Error", "Please provide a transaction hash.")
             return
 
-        try:
-            response = requests.get(f"{API_BASE_URL}/get_correct_answers", params={"tx_hash": tx_hash})
-            response.raise_for_status()
-            correct_answers = response.json().get("correct_answers", "No result")
-            self.log_message(f"Correct answers: {correct_answers}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+        self.run_task("Fetching correct answers", self.get_correct_answers_task, self.on_correct_answers_fetched, tx_hash)
+
+    def get_correct_answers_task(self, worker, tx_hash):
+        response = http.get(f"{API_BASE_URL}/get_correct_answers", params={"tx_hash": tx_hash}, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.json().get("correct_answers", "No result")
+
+    def on_correct_answers_fetched(self, correct_answers):
+        self.log_message(f"Correct answers: {correct_answers}")
 
     def get_test_results(self):
         contract_address = self.contract_input.text().strip()
@@ -205,19 +665,35 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Error", "Please provide both the contract address and sender address.")
             return
 
-        try:
-            response = requests.post(
-                f"{API_BASE_URL}/get_test_results",
-                json={
-                    "contract_address": contract_address,
-                    "user_address": sender_address,
-                }
-            )
-            response.raise_for_status()
-            test_results = response.json().get("test_results", "No result")
-            self.log_message(f"Final Score: {test_results}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+        self.run_task("Fetching final score", self.get_test_results_task, self.on_test_results_fetched, contract_address, sender_address)
+
+    def get_test_results_task(self, worker, contract_address, sender_address):
+        response = http.post(
+            f"{API_BASE_URL}/get_test_results",
+            json={
+                "contract_address": contract_address,
+                "user_address": sender_address,
+            },
+            timeout=REQUEST_TIMEOUT
+        )
+        response.raise_for_status()
+        return response.json().get("test_results", "No result")
+
+    def on_test_results_fetched(self, test_results):
+        self.log_message(f"Final Score: {test_results}")
+
+    def open_dashboard(self):
+        contract_address = self.contract_input.text().strip()
+        if not contract_address:
+            QMessageBox.critical(self, "Error", "Please provide a contract address.")
+            return
+
+        if self.dashboard is None:
+            self.dashboard = DashboardWindow(self.thread_pool, contract_address)
+        elif self.dashboard.model.contract_address != contract_address:
+            self.dashboard.set_contract(contract_address)
+        self.dashboard.show()
+        self.dashboard.raise_()
 
 def main():
     app = QApplication(sys.argv)